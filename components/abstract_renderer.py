@@ -14,6 +14,7 @@ The module also includes helper functions and decorators used by the renderer.
 # Imports
 # ------------------------------------------------------------------------------
 import functools
+import math
 import os
 import time
 from abc import ABC, abstractmethod
@@ -26,6 +27,7 @@ from OpenGL.raw.GL.EXT.texture_filter_anisotropic import GL_TEXTURE_MAX_ANISOTRO
 from PIL import Image
 
 from components.camera_control import CameraController
+from components.gl_state import GLState
 from components.shader_engine import ShaderEngine
 from components.shadow_map_manager import ShadowMapManager
 from components.texture_manager import TextureManager
@@ -36,12 +38,42 @@ from utils.image_saver import ImageSaver
 # Global Managers
 # ------------------------------------------------------------------------------
 texture_manager = TextureManager()
+gl_state = GLState()
 image_saver = ImageSaver(screenshots_dir="screenshots")
 
+# Uniform buffer binding point and std140 size (bytes) of the shaders' MaterialBlock
+MATERIAL_BLOCK_BINDING = 0
+MATERIAL_BLOCK_SIZE = 80
+
+# Size of the shaders' light uniform arrays (lightPositions[10] etc.)
+MAX_LIGHTS = 10
+
+# Texture types loaded from texture_paths, with the sampler uniform each is bound to
+MAP_TEXTURE_UNIFORMS = (
+    ("diffuse", "diffuseMap"),
+    ("normal", "normalMap"),
+    ("displacement", "displacementMap"),
+)
+
 
 # ------------------------------------------------------------------------------
 # Helper Functions
 # ------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=32)
+def get_vertex_stride(vertex_format):
+    """
+    Compute the vertex stride (number of components) from a pywavefront vertex format
+    string such as "T2F_N3F_V3F". Only a handful of formats exist, so results are cached
+    and per-frame callers skip the string parsing.
+
+    :param vertex_format: The vertex format string.
+    """
+    count = 0
+    for part in vertex_format.split("_"):
+        count += int(part[1])
+    return count
+
+
 def check_gl_error(context: str, debug_mode: bool):
     """
     Check for OpenGL errors if debug_mode is enabled.
@@ -55,6 +87,16 @@ def check_gl_error(context: str, debug_mode: bool):
             raise RuntimeError(f"OpenGL error in {context}: {gl_error}")
 
 
+def create_uniform_buffer(data):
+    """
+    Create a uniform buffer object holding the given data.
+
+    :param data: A numpy array laid out to match the target uniform block.
+    :return: The OpenGL buffer handle.
+    """
+    return gl_state.create_static_buffer(data, GL_UNIFORM_BUFFER)
+
+
 # ------------------------------------------------------------------------------
 # Decorators
 # ------------------------------------------------------------------------------
@@ -67,6 +109,7 @@ def with_gl_render_state(func):
     @functools.wraps(func)
     def render_config(self, *args, **kwargs):
         # Use the main shader program.
+        shader_program = self.shader_engine.shader_program
         self.shader_engine.use_shader_program()
         check_gl_error("glUseProgram", self.debug_mode)
 
@@ -86,7 +129,7 @@ def with_gl_render_state(func):
 
         # --- Set view position uniform ---
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "viewPosition"),
+            self.shader_engine.get_uniform_location(shader_program, "viewPosition"),
             1,
             glm.value_ptr(self.camera_position),
         )
@@ -107,7 +150,7 @@ def with_gl_render_state(func):
 
         # --- Set Lighting and Other Uniforms ---
         if self.lights_enabled:
-            self.set_light_uniforms(self.shader_engine.shader_program)
+            self.set_light_uniforms(shader_program)
         check_gl_error("set_light_uniforms", self.debug_mode)
 
         self.set_shader_uniforms()
@@ -116,14 +159,17 @@ def with_gl_render_state(func):
         self.set_shadow_shader_uniforms()
         check_gl_error("set_shadow_shader_uniforms", self.debug_mode)
 
+        # --- Material Block ---
+        if self.material_ubo:
+            gl_state.bind_uniform_buffer(MATERIAL_BLOCK_BINDING, self.material_ubo)
+
         # --- Call the Decorated Render Function ---
         result = func(self, *args, **kwargs)
         check_gl_error("render function", self.debug_mode)
 
-        # --- Unbind Textures and Reset State ---
-        glBindTexture(GL_TEXTURE_2D, 0)
-        check_gl_error("Unbind textures", self.debug_mode)
-
+        # --- Reset State ---
+        # Textures stay bound to their own units; unbinding here would only hit
+        # whichever unit happens to be active.
         if self.alpha_blending:
             glDisable(GL_BLEND)
         if self.depth_testing:
@@ -218,6 +264,7 @@ class AbstractRenderer(ABC):
         self.debug_mode = debug_mode
         self.dynamic_attrs = kwargs
         self.identifier = self  # Used for texture manager keys
+        self.texture_units = {}
 
         # --------------------------------------------------------------------------
         # Planar Rendering Attributes
@@ -243,6 +290,8 @@ class AbstractRenderer(ABC):
         # --------------------------------------------------------------------------
         self.view = None
         self.projection = None
+        self.view_dirty = True
+        self.projection_dirty = True
 
         # --------------------------------------------------------------------------
         # Shader and Texture Configurations
@@ -397,6 +446,7 @@ class AbstractRenderer(ABC):
             ]
         else:
             self.lights = []
+        self.pack_light_arrays()
 
         # --------------------------------------------------------------------------
         # Camera Controller Initialization
@@ -449,6 +499,18 @@ class AbstractRenderer(ABC):
         """
         return self.shadowing_enabled
 
+    def get_texture_unit(self, texture_type):
+        """
+        Return this renderer's texture unit for a texture type, caching the lookup
+        so per-frame callers skip building the texture manager key.
+        :param texture_type: A name for the texture's role (diffuse, shadow_map, etc.).
+        """
+        texture_unit = self.texture_units.get(texture_type)
+        if texture_unit is None:
+            texture_unit = texture_manager.get_texture_unit(str(self.identifier), texture_type)
+            self.texture_units[texture_type] = texture_unit
+        return texture_unit
+
     # --------------------------------------------------------------------------
     # Setup and Initialization Methods
     # --------------------------------------------------------------------------
@@ -473,7 +535,7 @@ class AbstractRenderer(ABC):
         self.depth_vis_fbo = glGenFramebuffers(1)
         self.depth_vis_texture = glGenTextures(1)
 
-        glBindTexture(GL_TEXTURE_2D, self.depth_vis_texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, self.depth_vis_texture)
         glTexImage2D(
             GL_TEXTURE_2D, 0, GL_RGB, self.window_size[0], self.window_size[1], 0, GL_RGB, GL_UNSIGNED_BYTE, None
         )
@@ -497,7 +559,8 @@ class AbstractRenderer(ABC):
         """
         Reads the depth map texture and saves an 8-bit grayscale image for debugging.
         """
-        glBindTexture(GL_TEXTURE_2D, self.shadow_map_manager.depth_map)
+        gl_state.active_texture(self.get_texture_unit("shadow_map"))
+        gl_state.bind_texture(GL_TEXTURE_2D, self.shadow_map_manager.depth_map)
         width = self.shadow_map_manager.shadow_width
         height = self.shadow_map_manager.shadow_height
 
@@ -517,12 +580,12 @@ class AbstractRenderer(ABC):
         """
         Set up the planar camera by creating a dedicated framebuffer and texture.
         """
-        texture_unit = texture_manager.get_texture_unit(str(self.identifier), "planar_camera")
-        glActiveTexture(GL_TEXTURE0 + texture_unit)
+        texture_unit = self.get_texture_unit("planar_camera")
+        gl_state.active_texture(texture_unit)
         self.planar_framebuffer = glGenFramebuffers(1)
         self.planar_texture = glGenTextures(1)
 
-        glBindTexture(GL_TEXTURE_2D, self.planar_texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, self.planar_texture)
         glTexImage2D(
             GL_TEXTURE_2D,
             0,
@@ -548,7 +611,7 @@ class AbstractRenderer(ABC):
             raise RuntimeError("Framebuffer for planar camera is not complete")
 
         self.screen_texture = self.planar_texture
-        glBindTexture(GL_TEXTURE_2D, self.screen_texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, self.screen_texture)
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
 
     # --------------------------------------------------------------------------
@@ -628,7 +691,6 @@ class AbstractRenderer(ABC):
             renderer.render_with_custom_camera(self.planar_view, self.planar_projection)
 
         if self.debug_mode and not self.screen_facing_planar_screenshotted:
-            glBindTexture(GL_TEXTURE_2D, self.screen_texture)
             data = glReadPixels(0, 0, self.planar_resolution[0], self.planar_resolution[1], GL_RGB, GL_UNSIGNED_BYTE)
             image = Image.frombytes("RGB", self.planar_resolution, data)
             image = image.transpose(Image.FLIP_TOP_BOTTOM)
@@ -641,7 +703,6 @@ class AbstractRenderer(ABC):
 
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
         glViewport(0, 0, self.window_size[0], self.window_size[1])
-        glBindTexture(GL_TEXTURE_2D, 0)
 
     def render_with_custom_camera(self, view_matrix, projection_matrix):
         """
@@ -649,8 +710,8 @@ class AbstractRenderer(ABC):
         :param view_matrix: The view matrix to use.
         :param projection_matrix: The projection matrix to use.
         """
-        self.view = view_matrix
-        self.projection = projection_matrix
+        self.set_view_matrix(view_matrix)
+        self.set_projection_matrix(projection_matrix)
         self.render()
 
     def render_from_light(self, light_space_matrix):
@@ -658,21 +719,31 @@ class AbstractRenderer(ABC):
         Render the object from the light's perspective to populate the shadow map.
         :param light_space_matrix: The light-space transformation matrix.
         """
+        shadow_program = self.shader_engine.shadow_shader_program
         self.apply_transformations()
         self.shader_engine.use_shadow_shader_program()
         glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shadow_shader_program, "model"),
+            self.shader_engine.get_uniform_location(shadow_program, "model"),
             1,
             GL_FALSE,
             glm.value_ptr(self.model_matrix),
         )
         glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shadow_shader_program, "lightSpaceMatrix"),
+            self.shader_engine.get_uniform_location(shadow_program, "lightSpaceMatrix"),
             1,
             GL_FALSE,
             glm.value_ptr(light_space_matrix),
         )
+        self.draw_from_light()
 
+        if self.debug_mode:
+            self.render_shadow_map_visualization()
+
+    def draw_from_light(self):
+        """
+        Issue the draw calls for the shadow pass; the shadow program and its uniforms
+        are already set up by render_from_light.
+        """
         if hasattr(self, "object") and hasattr(self.object, "mesh_list"):
             for i, mesh in enumerate(self.object.mesh_list):
                 if hasattr(mesh, "materials"):
@@ -681,19 +752,17 @@ class AbstractRenderer(ABC):
                         vertices = material.vertices
                         if not vertices:
                             continue
-                        count = len(vertices) // self.get_vertex_stride(material.vertex_format)
+                        count = len(vertices) // get_vertex_stride(material.vertex_format)
                         if vao_counter < len(self.vaos):
-                            glBindVertexArray(self.vaos[vao_counter])
+                            gl_state.bind_vao(self.vaos[vao_counter])
                             glDrawArrays(GL_TRIANGLES, 0, count)
-                            glBindVertexArray(0)
                         else:
                             print("Warning: VAO index out of range for mesh list.")
                         vao_counter += 1
                 else:
                     if i < len(self.vaos):
-                        glBindVertexArray(self.vaos[i])
+                        gl_state.bind_vao(self.vaos[i])
                         glDrawArrays(GL_TRIANGLES, 0, len(mesh.faces) * 3)
-                        glBindVertexArray(0)
                     else:
                         print("Warning: VAO index out of range for mesh list.")
         else:
@@ -701,15 +770,11 @@ class AbstractRenderer(ABC):
                 for material, vao, count in zip(self.materials, self.vaos, self.vertex_counts):
                     if count == 0:
                         continue
-                    glBindVertexArray(vao)
+                    gl_state.bind_vao(vao)
                     glDrawArrays(GL_TRIANGLES, 0, count)
-                    glBindVertexArray(0)
             else:
                 print("No mesh_list or materials/vertex_counts to render from light.")
 
-        if self.debug_mode:
-            self.render_shadow_map_visualization()
-
     # --------------------------------------------------------------------------
     # Shader and Texture Loading Methods
     # --------------------------------------------------------------------------
@@ -733,6 +798,23 @@ class AbstractRenderer(ABC):
             shadow_vertex_shader_path,
             shadow_fragment_shader_path,
         )
+        self.setup_material_block()
+
+    def setup_material_block(self):
+        """
+        Point the shader's MaterialBlock at its binding point and give the renderer a
+        zero-filled material buffer, so renderers without materials of their own do not
+        read whichever material buffer was bound last.
+        """
+        self.material_ubo = None
+        shader_program = self.shader_engine.shader_program
+        if not shader_program:
+            return
+        block_index = glGetUniformBlockIndex(shader_program, "MaterialBlock")
+        if block_index == GL_INVALID_INDEX:
+            return
+        glUniformBlockBinding(shader_program, block_index, MATERIAL_BLOCK_BINDING)
+        self.material_ubo = create_uniform_buffer(np.zeros(MATERIAL_BLOCK_SIZE // 4, dtype=np.float32))
 
     def load_textures(self):
         """
@@ -741,17 +823,23 @@ class AbstractRenderer(ABC):
         """
         self.shader_engine.use_shader_program()
         if self.texture_paths:
-            self.load_and_set_texture("diffuse", "diffuseMap")
-            self.load_and_set_texture("normal", "normalMap")
-            self.load_and_set_texture("displacement", "displacementMap")
+            for texture_type, uniform_name in MAP_TEXTURE_UNIFORMS:
+                self.load_and_set_texture(texture_type, uniform_name)
 
-        self.environmentMap = glGenTextures(1)
-        env_map_unit = texture_manager.get_texture_unit(str(self.identifier), "environment")
-        glActiveTexture(GL_TEXTURE0 + env_map_unit)
+        env_map_unit = self.get_texture_unit("environment")
+        gl_state.active_texture(env_map_unit)
         if self.cubemap_folder:
-            self.load_cubemap(self.cubemap_folder, self.environmentMap)
-        glBindTexture(GL_TEXTURE_CUBE_MAP, self.environmentMap)
-        glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, "environmentMap"), env_map_unit)
+            self.environmentMap = texture_manager.get_or_load(
+                self.cubemap_folder, self.load_cubemap, (self.anisotropy, self.env_map_lod_bias)
+            )
+        else:
+            # Bind the new name to its target once so a texture object exists before glBindTextureUnit
+            self.environmentMap = glGenTextures(1)
+            gl_state.bind_texture(GL_TEXTURE_CUBE_MAP, self.environmentMap)
+        gl_state.bind_texture_unit(env_map_unit, GL_TEXTURE_CUBE_MAP, self.environmentMap)
+        glUniform1i(
+            self.shader_engine.get_uniform_location(self.shader_engine.shader_program, "environmentMap"), env_map_unit
+        )
 
     def load_and_set_texture(self, texture_type, uniform_name):
         """
@@ -760,12 +848,15 @@ class AbstractRenderer(ABC):
         :param texture_type: A key in texture_paths (e.g. "diffuse").
         :param uniform_name: The name of the uniform in the shader.
         """
-        texture_map = glGenTextures(1)
-        texture_unit = texture_manager.get_texture_unit(str(self.identifier), texture_type)
-        glActiveTexture(GL_TEXTURE0 + texture_unit)
-        self.load_texture(self.texture_paths[texture_type], texture_map)
-        glBindTexture(GL_TEXTURE_2D, texture_map)
-        glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, uniform_name), texture_unit)
+        texture_unit = self.get_texture_unit(texture_type)
+        gl_state.active_texture(texture_unit)
+        texture_map = texture_manager.get_or_load(
+            self.texture_paths[texture_type], self.load_texture, (self.anisotropy, self.texture_lod_bias)
+        )
+        gl_state.bind_texture_unit(texture_unit, GL_TEXTURE_2D, texture_map)
+        glUniform1i(
+            self.shader_engine.get_uniform_location(self.shader_engine.shader_program, uniform_name), texture_unit
+        )
 
     def load_texture(self, path, texture):
         """
@@ -776,7 +867,7 @@ class AbstractRenderer(ABC):
         surface = pygame.image.load(path)
         img_data = pygame.image.tostring(surface, "RGB", True)
         width, height = surface.get_size()
-        glBindTexture(GL_TEXTURE_2D, texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, img_data)
         glGenerateMipmap(GL_TEXTURE_2D)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
@@ -785,7 +876,7 @@ class AbstractRenderer(ABC):
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
         glTexParameterf(GL_TEXTURE_2D, GL_TEXTURE_MAX_ANISOTROPY_EXT, self.anisotropy)
         glTexParameterf(GL_TEXTURE_2D, GL_TEXTURE_LOD_BIAS, self.texture_lod_bias)
-        glBindTexture(GL_TEXTURE_2D, 0)
+        gl_state.bind_texture(GL_TEXTURE_2D, 0)
 
     def load_cubemap(self, folder_path, texture):
         """
@@ -794,16 +885,27 @@ class AbstractRenderer(ABC):
         :param texture: OpenGL texture handle.
         """
         faces = ["right.png", "left.png", "top.png", "bottom.png", "front.png", "back.png"]
-        glBindTexture(GL_TEXTURE_CUBE_MAP, texture)
-        for i, face in enumerate(faces):
-            face_path = os.path.join(folder_path, face)
-            surface = pygame.image.load(face_path)
+        face_images = []
+        for face in faces:
+            surface = pygame.image.load(os.path.join(folder_path, face))
             surface = pygame.transform.flip(surface, False, True)
-            img_data = pygame.image.tostring(surface, "RGB", True)
-            width, height = surface.get_size()
-            glTexImage2D(
-                GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, img_data
-            )
+            face_images.append((pygame.image.tostring(surface, "RGB", True), surface.get_size()))
+
+        gl_state.bind_texture(GL_TEXTURE_CUBE_MAP, texture)
+        if gl_state.supports_texture_storage():
+            # Allocate all six faces and the full mip chain once, then fill the base level
+            width, height = face_images[0][1]
+            levels = int(math.log2(max(width, height))) + 1
+            glTexStorage2D(GL_TEXTURE_CUBE_MAP, levels, GL_RGB8, width, height)
+            for i, (img_data, (width, height)) in enumerate(face_images):
+                glTexSubImage2D(
+                    GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, 0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE, img_data
+                )
+        else:
+            for i, (img_data, (width, height)) in enumerate(face_images):
+                glTexImage2D(
+                    GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, img_data
+                )
         glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
         glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
         glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
@@ -812,7 +914,7 @@ class AbstractRenderer(ABC):
         glTexParameterf(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAX_ANISOTROPY_EXT, self.anisotropy)
         glTexParameterf(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_LOD_BIAS, self.env_map_lod_bias)
         glGenerateMipmap(GL_TEXTURE_CUBE_MAP)
-        glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
+        gl_state.bind_texture(GL_TEXTURE_CUBE_MAP, 0)
 
     # --------------------------------------------------------------------------
     # Camera Setup Methods
@@ -852,28 +954,103 @@ class AbstractRenderer(ABC):
         forward_direction = glm.vec3(rotation_matrix * glm.vec4(0.0, 0.0, -1.0, 0.0))
         up_vector = glm.vec3(0.0, 1.0, 0.0)
 
-        self.view = glm.lookAt(self.camera_position, self.camera_position + forward_direction, up_vector)
+        view = glm.lookAt(self.camera_position, self.camera_position + forward_direction, up_vector)
         lens_rotation_matrix = glm.rotate(glm.mat4(1.0), glm.radians(self.main_camera_lens_rotation), forward_direction)
-        self.view = lens_rotation_matrix * self.view
+        self.set_view_matrix(lens_rotation_matrix * view)
+
+        self.set_projection_matrix(
+            glm.perspective(glm.radians(self.fov), aspect_ratio, self.near_plane, self.far_plane)
+        )
+
+    def set_view_matrix(self, view):
+        """
+        Set the view matrix, flagging it for upload only if it actually changed.
+        """
+        if view != self.view:
+            self.view = view
+            self.view_dirty = True
 
-        self.projection = glm.perspective(glm.radians(self.fov), aspect_ratio, self.near_plane, self.far_plane)
+    def set_projection_matrix(self, projection):
+        """
+        Set the projection matrix, flagging it for upload only if it actually changed.
+        """
+        if projection != self.projection:
+            self.projection = projection
+            self.projection_dirty = True
+
+    @property
+    def lights(self):
+        """
+        The light sources; assigning a new list flags the packed arrays for a rebuild.
+        """
+        return self._lights
+
+    @lights.setter
+    def lights(self, lights):
+        self._lights = lights
+        self.lights_dirty = True
+
+    def mark_lights_dirty(self):
+        """
+        Flag the packed light arrays for a rebuild after the lights were modified in place.
+        """
+        self.lights_dirty = True
+
+    def pack_light_arrays(self):
+        """
+        Pack the per-light parameters into contiguous float32 arrays so each
+        uniform array can be uploaded with a single glUniform*fv call.
+        Lights beyond MAX_LIGHTS are dropped, since the shader arrays cannot hold them.
+        """
+        lights = self.lights[:MAX_LIGHTS]
+        if len(self.lights) > MAX_LIGHTS:
+            print(f"Warning: {len(self.lights)} lights given, only the first {MAX_LIGHTS} will be used.")
+        self.light_count = len(lights)
+        self.light_positions = np.array([tuple(light["position"]) for light in lights], dtype=np.float32)
+        self.light_colors = np.array([tuple(light["color"]) for light in lights], dtype=np.float32)
+        self.light_strengths = np.array([light["strength"] for light in lights], dtype=np.float32)
+        self.light_orth_lefts = np.array([light["orth_left"] for light in lights], dtype=np.float32)
+        self.light_orth_rights = np.array([light["orth_right"] for light in lights], dtype=np.float32)
+        self.light_orth_bottoms = np.array([light["orth_bottom"] for light in lights], dtype=np.float32)
+        self.light_orth_tops = np.array([light["orth_top"] for light in lights], dtype=np.float32)
+        self.lights_dirty = False
 
     def set_light_uniforms(self, shader_program):
         """
-        Set light-related uniforms in the shader.
+        Set light-related uniforms in the shader, uploading each light array in one call.
+        The arrays are repacked first if the lights changed since the last upload.
         """
+        if self.lights_dirty:
+            self.pack_light_arrays()
         self.shader_engine.use_shader_program()
-        for i, light in enumerate(self.lights):
+        if self.light_count:
+            count = self.light_count
+            glUniform3fv(
+                self.shader_engine.get_uniform_location(shader_program, "lightPositions"), count, self.light_positions
+            )
             glUniform3fv(
-                glGetUniformLocation(shader_program, f"lightPositions[{i}]"), 1, glm.value_ptr(light["position"])
+                self.shader_engine.get_uniform_location(shader_program, "lightColors"), count, self.light_colors
+            )
+            glUniform1fv(
+                self.shader_engine.get_uniform_location(shader_program, "lightStrengths"), count, self.light_strengths
+            )
+            glUniform1fv(
+                self.shader_engine.get_uniform_location(shader_program, "lightOrthoLeft"), count, self.light_orth_lefts
+            )
+            glUniform1fv(
+                self.shader_engine.get_uniform_location(shader_program, "lightOrthoRight"),
+                count,
+                self.light_orth_rights,
+            )
+            glUniform1fv(
+                self.shader_engine.get_uniform_location(shader_program, "lightOrthoBottom"),
+                count,
+                self.light_orth_bottoms,
             )
-            glUniform3fv(glGetUniformLocation(shader_program, f"lightColors[{i}]"), 1, glm.value_ptr(light["color"]))
-            glUniform1f(glGetUniformLocation(shader_program, f"lightStrengths[{i}]"), light["strength"])
-            glUniform1f(glGetUniformLocation(shader_program, f"lightOrthoLeft[{i}]"), light["orth_left"])
-            glUniform1f(glGetUniformLocation(shader_program, f"lightOrthoRight[{i}]"), light["orth_right"])
-            glUniform1f(glGetUniformLocation(shader_program, f"lightOrthoBottom[{i}]"), light["orth_bottom"])
-            glUniform1f(glGetUniformLocation(shader_program, f"lightOrthoTop[{i}]"), light["orth_top"])
-        glUniform1i(glGetUniformLocation(shader_program, "lightingMode"), self.lighting_mode)
+            glUniform1fv(
+                self.shader_engine.get_uniform_location(shader_program, "lightOrthoTop"), count, self.light_orth_tops
+            )
+        glUniform1i(self.shader_engine.get_uniform_location(shader_program, "lightingMode"), self.lighting_mode)
 
     # --------------------------------------------------------------------------
     # Transformation Methods
@@ -973,14 +1150,15 @@ class AbstractRenderer(ABC):
         """
         Set uniforms that remain constant for the shader program.
         """
+        shader_program = self.shader_engine.shader_program
         self.shader_engine.use_shader_program()
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "textureLodLevel"), self.texture_lod_bias)
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "envMapLodLevel"), self.env_map_lod_bias)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "textureLodLevel"), self.texture_lod_bias)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "envMapLodLevel"), self.env_map_lod_bias)
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "applyToneMapping"), int(self.apply_tone_mapping)
+            self.shader_engine.get_uniform_location(shader_program, "applyToneMapping"), int(self.apply_tone_mapping)
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "applyGammaCorrection"),
+            self.shader_engine.get_uniform_location(shader_program, "applyGammaCorrection"),
             int(self.apply_gamma_correction),
         )
 
@@ -989,169 +1167,175 @@ class AbstractRenderer(ABC):
         Set various dynamic uniforms in the shader including model, view, projection,
         parallax mapping parameters, lighting, and material properties.
         """
+        shader_program = self.shader_engine.shader_program
         self.shader_engine.use_shader_program()
 
         glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "model"),
+            self.shader_engine.get_uniform_location(shader_program, "model"),
             1,
             GL_FALSE,
             glm.value_ptr(self.model_matrix),
         )
-        glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "view"), 1, GL_FALSE, glm.value_ptr(self.view)
-        )
-        glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "projection"),
-            1,
-            GL_FALSE,
-            glm.value_ptr(self.projection),
-        )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "nearPlane"), self.near_plane)
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "farPlane"), self.far_plane)
+        # View and projection persist in the program, so only re-upload them when they changed.
+        if self.view_dirty:
+            glUniformMatrix4fv(
+                self.shader_engine.get_uniform_location(shader_program, "view"), 1, GL_FALSE, glm.value_ptr(self.view)
+            )
+            self.view_dirty = False
+        if self.projection_dirty:
+            glUniformMatrix4fv(
+                self.shader_engine.get_uniform_location(shader_program, "projection"),
+                1,
+                GL_FALSE,
+                glm.value_ptr(self.projection),
+            )
+            self.projection_dirty = False
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "nearPlane"), self.near_plane)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "farPlane"), self.far_plane)
 
         if self.shadow_map_manager and self.shadowing_enabled and self.lights_enabled:
             glUniformMatrix4fv(
-                glGetUniformLocation(self.shader_engine.shader_program, "lightSpaceMatrix"),
+                self.shader_engine.get_uniform_location(shader_program, "lightSpaceMatrix"),
                 1,
                 GL_FALSE,
                 glm.value_ptr(self.shadow_map_manager.light_space_matrix),
             )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "shadowingEnabled"), int(self.shadowing_enabled)
+            self.shader_engine.get_uniform_location(shader_program, "shadowingEnabled"), int(self.shadowing_enabled)
         )
 
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "invertDisplacementMap"),
+            self.shader_engine.get_uniform_location(shader_program, "invertDisplacementMap"),
             int(self.invert_displacement_map),
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "pomHeightScale"), self.pom_height_scale)
-        glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, "pomMinSteps"), self.pom_min_steps)
-        glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, "pomMaxSteps"), self.pom_max_steps)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "pomHeightScale"), self.pom_height_scale)
+        glUniform1i(self.shader_engine.get_uniform_location(shader_program, "pomMinSteps"), self.pom_min_steps)
+        glUniform1i(self.shader_engine.get_uniform_location(shader_program, "pomMaxSteps"), self.pom_max_steps)
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "parallaxEyeOffsetScale"), self.pom_eye_offset_scale
+            self.shader_engine.get_uniform_location(shader_program, "parallaxEyeOffsetScale"), self.pom_eye_offset_scale
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "parallaxMaxDepthClamp"), self.pom_max_depth_clamp
+            self.shader_engine.get_uniform_location(shader_program, "parallaxMaxDepthClamp"), self.pom_max_depth_clamp
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "maxForwardOffset"), self.pom_max_forward_offset
+            self.shader_engine.get_uniform_location(shader_program, "maxForwardOffset"), self.pom_max_forward_offset
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "enableFragDepthAdjustment"),
+            self.shader_engine.get_uniform_location(shader_program, "enableFragDepthAdjustment"),
             int(self.pom_enable_frag_depth_adjustment),
         )
 
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "ambientStrength"), self.ambient_lighting_strength
+            self.shader_engine.get_uniform_location(shader_program, "ambientStrength"), self.ambient_lighting_strength
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "ambientColor"),
+            self.shader_engine.get_uniform_location(shader_program, "ambientColor"),
             1,
             glm.value_ptr(self.ambient_lighting_color),
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "legacyOpacity"), self.legacy_opacity)
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "legacyRoughness"), self.legacy_roughness)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "legacyOpacity"), self.legacy_opacity)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "legacyRoughness"), self.legacy_roughness)
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "environmentMapStrength"), self.env_map_strength
+            self.shader_engine.get_uniform_location(shader_program, "environmentMapStrength"), self.env_map_strength
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "distortionStrength"), self.distortion_strength
+            self.shader_engine.get_uniform_location(shader_program, "distortionStrength"), self.distortion_strength
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "refractionStrength"), self.refraction_strength
+            self.shader_engine.get_uniform_location(shader_program, "refractionStrength"), self.refraction_strength
         )
 
         glUniform2f(
-            glGetUniformLocation(self.shader_engine.shader_program, "screenResolution"),
+            self.shader_engine.get_uniform_location(shader_program, "screenResolution"),
             self.window_size[0],
             self.window_size[1],
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "planarCameraEnabled"), int(self.planar_camera)
+            self.shader_engine.get_uniform_location(shader_program, "planarCameraEnabled"), int(self.planar_camera)
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "flipPlanarHorizontal"),
+            self.shader_engine.get_uniform_location(shader_program, "flipPlanarHorizontal"),
             int(self.flip_planar_horizontally),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "flipPlanarVertical"),
+            self.shader_engine.get_uniform_location(shader_program, "flipPlanarVertical"),
             int(self.flip_planar_vertically),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "usePlanarNormalDistortion"),
+            self.shader_engine.get_uniform_location(shader_program, "usePlanarNormalDistortion"),
             int(self.use_planar_normal_distortion),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "planarFragmentViewThreshold"),
+            self.shader_engine.get_uniform_location(shader_program, "planarFragmentViewThreshold"),
             self.planar_fragment_view_threshold,
         )
         if self.screen_texture:
-            screen_texture_unit = texture_manager.get_texture_unit(str(self.identifier), "planar_camera")
-            glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, "screenTexture"), screen_texture_unit)
+            screen_texture_unit = self.get_texture_unit("planar_camera")
+            glUniform1i(self.shader_engine.get_uniform_location(shader_program, "screenTexture"), screen_texture_unit)
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "screenFacingPlanarTexture"),
+            self.shader_engine.get_uniform_location(shader_program, "screenFacingPlanarTexture"),
             int(self.screen_facing_planar_texture),
         )
 
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "useCheckerPattern"),
+            self.shader_engine.get_uniform_location(shader_program, "useCheckerPattern"),
             int(self.dynamic_attrs.get("use_checker_pattern", 1)),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "waterBaseColor"),
+            self.shader_engine.get_uniform_location(shader_program, "waterBaseColor"),
             1,
             glm.value_ptr(self.water_base_color),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "lavaBaseColor"),
+            self.shader_engine.get_uniform_location(shader_program, "lavaBaseColor"),
             1,
             glm.value_ptr(self.lava_base_color),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "lavaBrightColor"),
+            self.shader_engine.get_uniform_location(shader_program, "lavaBrightColor"),
             1,
             glm.value_ptr(self.lava_bright_color),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "waveSpeed"),
+            self.shader_engine.get_uniform_location(shader_program, "waveSpeed"),
             self.dynamic_attrs.get("wave_speed", 10.0),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "waveAmplitude"),
+            self.shader_engine.get_uniform_location(shader_program, "waveAmplitude"),
             self.dynamic_attrs.get("wave_amplitude", 0.1),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "waveDetail"),
+            self.shader_engine.get_uniform_location(shader_program, "waveDetail"),
             self.dynamic_attrs.get("wave_detail", 10.0),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "randomness"),
+            self.shader_engine.get_uniform_location(shader_program, "randomness"),
             self.dynamic_attrs.get("randomness", 0.8),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "texCoordFrequency"),
+            self.shader_engine.get_uniform_location(shader_program, "texCoordFrequency"),
             self.dynamic_attrs.get("tex_coord_frequency", 100.0),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "texCoordAmplitude"),
+            self.shader_engine.get_uniform_location(shader_program, "texCoordAmplitude"),
             self.dynamic_attrs.get("tex_coord_amplitude", 0.1),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "surfaceDepth"),
+            self.shader_engine.get_uniform_location(shader_program, "surfaceDepth"),
             self.dynamic_attrs.get("surface_depth", 0.0),
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "shadowStrength"), self.shadow_strength)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "shadowStrength"), self.shadow_strength)
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "cameraPos"), 1, glm.value_ptr(self.camera_position)
+            self.shader_engine.get_uniform_location(shader_program, "cameraPos"), 1, glm.value_ptr(self.camera_position)
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "time"), pygame.time.get_ticks() / 1000.0)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "time"), pygame.time.get_ticks() / 1000.0)
 
     def create_dummy_texture(self):
         """
         Create a dummy texture (1x1 white) to use when no valid shadow map is available.
         """
         dummy_texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, dummy_texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, dummy_texture)
         data = np.array([1.0], dtype=np.float32)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_DEPTH_COMPONENT, 1, 1, 0, GL_DEPTH_COMPONENT, GL_FLOAT, data)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -1163,27 +1347,26 @@ class AbstractRenderer(ABC):
         Set uniforms related to shadow mapping. Bind the actual shadow map if available;
         otherwise, bind a dummy texture.
         """
+        shader_program = self.shader_engine.shader_program
         self.shader_engine.use_shader_program()
-        shadow_map_unit = texture_manager.get_texture_unit(str(self.identifier), "shadow_map")
-        glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, "shadowMap"), shadow_map_unit)
-        glActiveTexture(GL_TEXTURE0 + shadow_map_unit)
+        shadow_map_unit = self.get_texture_unit("shadow_map")
+        glUniform1i(self.shader_engine.get_uniform_location(shader_program, "shadowMap"), shadow_map_unit)
 
         if self.shadow_map_manager and self.shadowing_enabled and self.lights_enabled:
             glUniformMatrix4fv(
-                glGetUniformLocation(self.shader_engine.shader_program, "lightSpaceMatrix"),
+                self.shader_engine.get_uniform_location(shader_program, "lightSpaceMatrix"),
                 1,
                 GL_FALSE,
                 glm.value_ptr(self.shadow_map_manager.light_space_matrix),
             )
+            # Read from the packed light array rather than the per-light dict
             glUniform3fv(
-                glGetUniformLocation(self.shader_engine.shader_program, "lightPosition"),
-                1,
-                glm.value_ptr(self.lights[0]["position"]),
+                self.shader_engine.get_uniform_location(shader_program, "lightPosition"), 1, self.light_positions[0]
             )
-            glBindTexture(GL_TEXTURE_2D, self.shadow_map_manager.depth_map)
+            gl_state.bind_texture_unit(shadow_map_unit, GL_TEXTURE_2D, self.shadow_map_manager.depth_map)
         else:
             dummy_texture = texture_manager.get_dummy_texture()
-            glBindTexture(GL_TEXTURE_2D, dummy_texture)
+            gl_state.bind_texture_unit(shadow_map_unit, GL_TEXTURE_2D, dummy_texture)
 
     # --------------------------------------------------------------------------
     # Camera Update and Shutdown Methods
@@ -1207,8 +1390,12 @@ class AbstractRenderer(ABC):
         """
         if hasattr(self, "vaos") and len(self.vaos) > 0:
             glDeleteVertexArrays(len(self.vaos), self.vaos)
+            gl_state.forget_vaos(self.vaos)
         if hasattr(self, "vbos") and len(self.vbos) > 0:
             glDeleteBuffers(len(self.vbos), self.vbos)
+        if getattr(self, "material_ubo", None):
+            glDeleteBuffers(1, [self.material_ubo])
+            gl_state.forget_uniform_buffers([self.material_ubo])
         self.shader_engine.delete_shader_programs()
 
     # --------------------------------------------------------------------------
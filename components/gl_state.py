@@ -0,0 +1,261 @@
+import numpy as np
+from OpenGL.GL import (
+    GL_ARRAY_BUFFER,
+    GL_STATIC_DRAW,
+    GL_TEXTURE0,
+    GL_UNIFORM_BUFFER,
+    glActiveTexture,
+    glBindBuffer,
+    glBindBufferBase,
+    glBindTexture,
+    glBindTextureUnit,
+    glBindVertexArray,
+    glBufferData,
+    glBufferStorage,
+    glCreateBuffers,
+    glGenBuffers,
+    glNamedBufferStorage,
+    glTexStorage2D,
+    glUseProgram,
+)
+
+from utils.decorators import singleton
+
+
+@singleton
+class GLState:
+    """
+    Tracks the OpenGL bindings this application changes most often and skips
+    calls that would re-bind what is already bound.
+
+    Tracks:
+      - The active texture unit
+      - The texture bound to each (unit, target) pair
+      - The bound vertex array object
+      - The program in use
+      - The uniform buffer bound to each uniform block binding point
+
+    The cache is only valid while every bind of these kinds goes through this
+    class, so components should not call glActiveTexture, glBindTexture,
+    glBindVertexArray, glUseProgram or glBindBufferBase(GL_UNIFORM_BUFFER) directly.
+    """
+
+    def __init__(self):
+        """
+        Initialize the GLState with nothing known about the context.
+        """
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all cached bindings, e.g. after a new context has been created.
+        Unknown state is stored as None so the next call of each kind always reaches GL.
+        """
+        self.active_unit = None
+        self.bound_textures = {}
+        self.bound_vao = None
+        self.bound_program = None
+        self.bound_uniform_buffers = {}
+        self.texture_unit_binding = None
+        self.buffer_storage = None
+        self.texture_storage = None
+        self.named_buffer_storage = None
+
+    def supports_texture_unit_binding(self):
+        """
+        Whether glBindTextureUnit (GL 4.5 / ARB_direct_state_access) is available.
+        Checked on first use, since the entry point can only be resolved once a context exists.
+        """
+        if self.texture_unit_binding is None:
+            self.texture_unit_binding = bool(glBindTextureUnit)
+        return self.texture_unit_binding
+
+    def supports_buffer_storage(self):
+        """
+        Whether glBufferStorage (GL 4.4 / ARB_buffer_storage) is available. Checked on first use.
+        """
+        if self.buffer_storage is None:
+            self.buffer_storage = bool(glBufferStorage)
+        return self.buffer_storage
+
+    def supports_texture_storage(self):
+        """
+        Whether glTexStorage2D (GL 4.2 / ARB_texture_storage) is available. Checked on first use.
+        """
+        if self.texture_storage is None:
+            self.texture_storage = bool(glTexStorage2D)
+        return self.texture_storage
+
+    def supports_named_buffer_storage(self):
+        """
+        Whether glCreateBuffers and glNamedBufferStorage (GL 4.5 / ARB_direct_state_access)
+        are available. Checked on first use.
+        """
+        if self.named_buffer_storage is None:
+            self.named_buffer_storage = bool(glCreateBuffers) and bool(glNamedBufferStorage)
+        return self.named_buffer_storage
+
+    def create_static_buffer(self, data, target=GL_ARRAY_BUFFER):
+        """
+        Create a buffer holding data that never changes after load. With direct state
+        access the buffer is created and filled without binding it anywhere; otherwise
+        it is bound to target, filled through upload_static_buffer and unbound again.
+
+        Args:
+            data (np.ndarray): The data to upload.
+            target (int): Binding point used by the fallback path.
+
+        Returns:
+            int: OpenGL buffer handle.
+        """
+        if self.supports_named_buffer_storage():
+            # PyOpenGL 3.1.6 takes the output array as an argument instead of returning names
+            names = np.zeros(1, dtype=np.uint32)
+            glCreateBuffers(1, names)
+            buffer = int(names[0])
+            glNamedBufferStorage(buffer, data.nbytes, data, 0)
+            return buffer
+
+        buffer = glGenBuffers(1)
+        glBindBuffer(target, buffer)
+        self.upload_static_buffer(target, data)
+        glBindBuffer(target, 0)
+        return buffer
+
+    def upload_static_buffer(self, target, data):
+        """
+        Upload data that never changes after load into the buffer bound to target.
+        Uses immutable storage when available, so the driver can keep it in GPU-local
+        memory without defensive copies; otherwise falls back to GL_STATIC_DRAW.
+
+        Args:
+            target (int): Buffer target (e.g. GL_ARRAY_BUFFER, GL_UNIFORM_BUFFER).
+            data (np.ndarray): The data to upload.
+        """
+        if self.supports_buffer_storage():
+            glBufferStorage(target, data.nbytes, data, 0)
+        else:
+            glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+
+    def active_texture(self, unit):
+        """
+        Make a texture unit active.
+
+        Args:
+            unit (int): Texture unit index (0-based, not GL_TEXTURE0 + index).
+        """
+        if self.active_unit != unit:
+            glActiveTexture(GL_TEXTURE0 + unit)
+            self.active_unit = unit
+
+    def bind_texture(self, target, texture):
+        """
+        Bind a texture to the given target on the active texture unit.
+
+        Args:
+            target (int): Texture target (e.g. GL_TEXTURE_2D, GL_TEXTURE_CUBE_MAP).
+            texture (int): OpenGL texture handle, or 0 to unbind.
+        """
+        key = (self.active_unit, target)
+        if self.active_unit is None or self.bound_textures.get(key) != texture:
+            glBindTexture(target, texture)
+            if self.active_unit is not None:
+                self.bound_textures[key] = texture
+
+    def bind_texture_unit(self, unit, target, texture):
+        """
+        Bind a texture to a specific texture unit. Uses glBindTextureUnit when available,
+        which needs one call and leaves the active unit alone; otherwise falls back to
+        glActiveTexture + glBindTexture.
+
+        Args:
+            unit (int): Texture unit index (0-based).
+            target (int): Texture target the texture was created with.
+            texture (int): OpenGL texture handle.
+        """
+        if not self.supports_texture_unit_binding():
+            self.active_texture(unit)
+            self.bind_texture(target, texture)
+            return
+
+        key = (unit, target)
+        if self.bound_textures.get(key) != texture:
+            glBindTextureUnit(unit, texture)
+            self.bound_textures[key] = texture
+
+    def bind_vao(self, vao):
+        """
+        Bind a vertex array object.
+
+        Args:
+            vao (int): OpenGL VAO handle, or 0 to unbind.
+        """
+        if self.bound_vao != vao:
+            glBindVertexArray(vao)
+            self.bound_vao = vao
+
+    def use_program(self, program):
+        """
+        Make a shader program current.
+
+        Args:
+            program (int): OpenGL program handle, or 0 for none.
+        """
+        if self.bound_program != program:
+            glUseProgram(program)
+            self.bound_program = program
+
+    def bind_uniform_buffer(self, binding, buffer):
+        """
+        Bind a uniform buffer to an indexed uniform block binding point.
+
+        Args:
+            binding (int): Uniform block binding point.
+            buffer (int): OpenGL buffer handle.
+        """
+        if self.bound_uniform_buffers.get(binding) != buffer:
+            glBindBufferBase(GL_UNIFORM_BUFFER, binding, buffer)
+            self.bound_uniform_buffers[binding] = buffer
+
+    def forget_textures(self, textures):
+        """
+        Drop cached bindings of textures that are being deleted, since GL
+        unbinds them and their names may be reused.
+
+        Args:
+            textures (iterable): OpenGL texture handles.
+        """
+        textures = set(textures)
+        self.bound_textures = {key: tex for key, tex in self.bound_textures.items() if tex not in textures}
+
+    def forget_uniform_buffers(self, buffers):
+        """
+        Drop cached binding points that refer to uniform buffers being deleted.
+
+        Args:
+            buffers (iterable): OpenGL buffer handles.
+        """
+        buffers = set(buffers)
+        self.bound_uniform_buffers = {
+            binding: buf for binding, buf in self.bound_uniform_buffers.items() if buf not in buffers
+        }
+
+    def forget_vaos(self, vaos):
+        """
+        Drop the cached VAO binding if it is among the VAOs being deleted.
+
+        Args:
+            vaos (iterable): OpenGL VAO handles.
+        """
+        if self.bound_vao in set(vaos):
+            self.bound_vao = None
+
+    def forget_program(self, program):
+        """
+        Drop the cached program if it is being deleted.
+
+        Args:
+            program (int): OpenGL program handle.
+        """
+        if self.bound_program == program:
+            self.bound_program = None
@@ -1,19 +1,51 @@
 # ------------------------------------------------------------------------------
 # Imports
 # ------------------------------------------------------------------------------
+import json
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pywavefront
 from OpenGL.GL import *
 
-from components.abstract_renderer import AbstractRenderer, with_gl_render_state
+from components.abstract_renderer import (
+    MATERIAL_BLOCK_BINDING,
+    MATERIAL_BLOCK_SIZE,
+    AbstractRenderer,
+    create_uniform_buffer,
+    with_gl_render_state,
+)
+from components.gl_state import GLState
+from components.obj_loader import fast_obj_load
 from components.texture_manager import TextureManager
 
 # ------------------------------------------------------------------------------
 # Global Variables / Managers
 # ------------------------------------------------------------------------------
 texture_manager = TextureManager()
+gl_state = GLState()
+# Parses models and builds their vertex data off the GL thread; NumPy releases the GIL
+# for most of that work, so several models can be prepared side by side
+model_loader = ThreadPoolExecutor(thread_name_prefix="model_loader")
+
+# Bump whenever the layout of PreparedGeometry or the packed vertex data changes,
+# so mesh caches written by older versions are rebuilt instead of misread
+MESH_CACHE_VERSION = 3
+
+# Friendly pbr_extension_overrides names -> .mtl extension tokens
+PBR_OVERRIDE_TOKENS = {
+    "roughness": "Pr",
+    "metallic": "Pm",
+    "clearcoat": "Pc",
+    "clearcoat_roughness": "Pcr",
+    "sheen": "Ps",
+    "anisotropy": "aniso",
+    "anisotropy_rot": "anisor",
+    "transmission": "Tf",
+    "fresnel_exponent": "Pfe",
+}
 
 
 # ------------------------------------------------------------------------------
@@ -86,40 +118,26 @@ def parse_pbr_extensions_from_mtl(mtl_path):
 
 
 # ------------------------------------------------------------------------------
-# Helper Functions: Upload Material Uniforms
+# Helper Functions: Material Uniform Block
 # ------------------------------------------------------------------------------
-def upload_material_uniforms(shader_program, material, fallback_pbr):
+def pack_material_block(material, fallback_pbr):
     """
-    Upload material uniforms to the GPU. If any expected uniform is not found,
-    raise a RuntimeError listing the missing uniforms.
+    Pack a material into the std140 layout of the shaders' MaterialBlock, ready to be
+    uploaded once into a uniform buffer.
 
     Parameters:
-        shader_program (int): The OpenGL shader program handle.
         material: The pywavefront material object.
         fallback_pbr (dict): A dictionary containing fallback PBR parameters.
+
+    Returns:
+        np.ndarray: MATERIAL_BLOCK_SIZE bytes of float32 data.
     """
-    uniform_names = {
-        "material.specular": "specular",
-        "material.ior": "ior",
-        "material.emissive": "emissive",
-        "material.illuminationModel": "illumination_model",
-        "material.roughness": "roughness",
-        "material.metallic": "metallic",
-        "material.clearcoat": "clearcoat",
-        "material.clearcoatRoughness": "clearcoat_roughness",
-        "material.sheen": "sheen",
-        "material.transmission": "transmission",
-        "material.fresnelExponent": "fresnel_exponent",
-    }
-
-    # Retrieve standard material properties from the material (with defaults)
-    ambient = getattr(material, "ambient", [0.2, 0.2, 0.2, 1.0])[:3]
-    diffuse = getattr(material, "diffuse", [0.8, 0.8, 0.8, 1.0])[:3]
+    # Retrieve standard material properties from the material (with defaults).
+    # Ka/Kd/d and the anisotropy terms are not consumed by the shaders, so they are not read here.
     specular = getattr(material, "specular", [0.5, 0.5, 0.5, 1.0])[:3]
     ior = getattr(material, "optical_density", 1.0)
     emissive = getattr(material, "emissive", [0.0, 0.0, 0.0, 1.0])[:3]
     illumination_model = getattr(material, "illumination_model", 2)
-    transparency = getattr(material, "transparency", 1.0)
 
     # Merge fallback PBR parameters with any extra PBR data from the material
     local_pbr = dict(fallback_pbr)
@@ -134,10 +152,6 @@ def upload_material_uniforms(shader_program, material, fallback_pbr):
         local_pbr["clearcoat_roughness"] = mat_pbr["Pcr"]
     if "Ps" in mat_pbr:
         local_pbr["sheen"] = mat_pbr["Ps"]
-    if "aniso" in mat_pbr:
-        local_pbr["anisotropy"] = mat_pbr["aniso"]
-    if "anisor" in mat_pbr:
-        local_pbr["anisotropy_rot"] = mat_pbr["anisor"]
     if "Tf" in mat_pbr:
         local_pbr["transmission"] = mat_pbr["Tf"]
     if "Pfe" in mat_pbr:
@@ -148,97 +162,533 @@ def upload_material_uniforms(shader_program, material, fallback_pbr):
     clearcoat = local_pbr.get("clearcoat", 0.0)
     clearcoat_roughness = local_pbr.get("clearcoat_roughness", 0.03)
     sheen = local_pbr.get("sheen", 0.0)
-    anisotropy = local_pbr.get("anisotropy", 0.0)
-    anisotropy_rot = local_pbr.get("anisotropy_rot", 0.0)
     transmission = local_pbr.get("transmission", (0.0, 0.0, 0.0))
     fresnel_exponent = local_pbr.get("fresnel_exponent", 0.5)
 
-    material_values = {
-        "ambient": ambient,
-        "diffuse": diffuse,
-        "specular": specular,
-        "ior": ior,
-        "emissive": emissive,
-        "illumination_model": illumination_model,
-        "transparency": transparency,
-        "roughness": roughness,
-        "metallic": metallic,
-        "clearcoat": clearcoat,
-        "clearcoat_roughness": clearcoat_roughness,
-        "sheen": sheen,
-        "anisotropy": anisotropy,
-        "anisotropy_rot": anisotropy_rot,
-        "transmission": transmission,
-        "fresnel_exponent": fresnel_exponent,
-    }
-
-    uniform_locations = {}
-    missing_uniforms = []
-    for uniform_name, key in uniform_names.items():
-        loc = glGetUniformLocation(shader_program, uniform_name)
-        uniform_locations[uniform_name] = loc
-        if loc == -1:
-            missing_uniforms.append(uniform_name)
-    if missing_uniforms:
-        raise RuntimeError("Uniform(s) not found in shader program: " + ", ".join(missing_uniforms))
-
-    glUniform3f(uniform_locations["material.specular"], *material_values["specular"])
-    glUniform1f(uniform_locations["material.ior"], float(material_values["ior"]))
-    glUniform3f(uniform_locations["material.emissive"], *material_values["emissive"])
-    glUniform1i(uniform_locations["material.illuminationModel"], int(material_values["illumination_model"]))
-    glUniform1f(uniform_locations["material.roughness"], material_values["roughness"])
-    glUniform1f(uniform_locations["material.metallic"], material_values["metallic"])
-    glUniform1f(uniform_locations["material.clearcoat"], material_values["clearcoat"])
-    glUniform1f(uniform_locations["material.clearcoatRoughness"], material_values["clearcoat_roughness"])
-    glUniform1f(uniform_locations["material.sheen"], material_values["sheen"])
-    glUniform3f(uniform_locations["material.transmission"], *material_values["transmission"])
-    glUniform1f(uniform_locations["material.fresnelExponent"], material_values["fresnel_exponent"])
+    # std140 offsets (in floats) match the MaterialBlock declaration in glsl_utilities.glsl
+    block = np.zeros(MATERIAL_BLOCK_SIZE // 4, dtype=np.float32)
+    block[0:3] = specular
+    block[3] = fresnel_exponent
+    block[4:7] = emissive
+    block[7:8].view(np.int32)[0] = int(illumination_model)
+    block[8:11] = transmission
+    block[11] = roughness
+    block[12] = metallic
+    block[13] = ior
+    block[14] = clearcoat
+    block[15] = clearcoat_roughness
+    block[16] = sheen
+    return block
+
+
+# ------------------------------------------------------------------------------
+# Helper Functions: Vertex Packing
+# ------------------------------------------------------------------------------
+# GPU vertex layout (28 bytes instead of 14 floats / 56 bytes), split in two streams
+# so position-only passes (shadow map, tile binning) fetch 12 bytes per vertex:
+#   stream 0: position  3 x float32              (full precision, models can be large)
+#   stream 1: normal    GL_INT_2_10_10_10_REV    (normalized, w unused)
+#             texCoords 2 x uint16 unorm         (every UV lies in [0, 1])
+#             tangent   GL_INT_2_10_10_10_REV
+#             bitangent GL_INT_2_10_10_10_REV
+PACKED_ATTRIBUTE_DTYPE = np.dtype(
+    [
+        ("normal", np.uint32),
+        ("tex_coords", np.uint16, 2),
+        ("tangent", np.uint32),
+        ("bitangent", np.uint32),
+    ]
+)
+# Same stream 1 layout with float32 texCoords (32 bytes per vertex in total), for models
+# with tiled or otherwise out-of-range UVs that unorm16 cannot represent
+FLOAT_UV_ATTRIBUTE_DTYPE = np.dtype(
+    [
+        ("normal", np.uint32),
+        ("tex_coords", np.float32, 2),
+        ("tangent", np.uint32),
+        ("bitangent", np.uint32),
+    ]
+)
+# UVs this close outside [0, 1] are rounding noise from the exporter and get clamped
+# rather than forcing the whole model onto float UVs
+UV_CLAMP_EPSILON = 1e-3
+
+
+def gather_t2f_n3f_v3f(blocks):
+    """
+    Concatenate pywavefront T2F_N3F_V3F vertex blocks into one [pos, normal, uv] array.
+    Each block is written straight into its rows of the preallocated output with three
+    slice copies, so the reorder and the concatenation cost a single pass.
+
+    Parameters:
+        blocks (list): M x 8 float32 arrays laid out as [u, v, nx, ny, nz, x, y, z].
+
+    Returns:
+        np.ndarray: N x 8 float32 array laid out as [x, y, z, nx, ny, nz, u, v].
+    """
+    vertices = np.empty((sum(len(block) for block in blocks), 8), dtype=np.float32)
+    row = 0
+    for block in blocks:
+        rows = vertices[row : row + len(block)]
+        rows[:, 0:3] = block[:, 5:8]
+        rows[:, 3:6] = block[:, 2:5]
+        rows[:, 6:8] = block[:, 0:2]
+        row += len(block)
+    return vertices
+
+
+def pack_snorm_10_10_10_2(vectors):
+    """
+    Pack an N x 3 array of unit vectors into GL_INT_2_10_10_10_REV words
+    (signed 10 bits per component, the 2-bit w left at 0).
+
+    Parameters:
+        vectors (np.ndarray): N x 3 array; components are clamped to [-1, 1].
+
+    Returns:
+        np.ndarray: N uint32 values.
+    """
+    scaled = np.rint(np.clip(vectors, -1.0, 1.0) * 511.0).astype(np.int32)
+    fields = scaled.astype(np.uint32) & np.uint32(0x3FF)
+    return fields[:, 0] | (fields[:, 1] << np.uint32(10)) | (fields[:, 2] << np.uint32(20))
+
+
+def pack_vertex_data(verts):
+    """
+    Convert an N x 14 float array ([pos, normal, uv, tangent, bitangent]) into a
+    position stream and a PACKED_ATTRIBUTE_DTYPE stream, or a FLOAT_UV_ATTRIBUTE_DTYPE
+    stream if the UVs reach outside [0, 1] by more than UV_CLAMP_EPSILON.
+
+    Parameters:
+        verts (np.ndarray): N x 14 float32 vertex data.
+
+    Returns:
+        tuple: (N x 3 float32 positions, packed attribute array,
+                True if UVs are unorm16 or False if float32).
+    """
+    positions = np.ascontiguousarray(verts[:, 0:3], dtype=np.float32)
+    tex_coords = verts[:, 6:8]
+    uv_normalized = bool(np.all((tex_coords >= -UV_CLAMP_EPSILON) & (tex_coords <= 1.0 + UV_CLAMP_EPSILON)))
+    packed = np.empty(verts.shape[0], dtype=PACKED_ATTRIBUTE_DTYPE if uv_normalized else FLOAT_UV_ATTRIBUTE_DTYPE)
+
+    normals = verts[:, 3:6]
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 1e-8)
+    packed["normal"] = pack_snorm_10_10_10_2(normals)
+
+    if uv_normalized:
+        packed["tex_coords"] = np.rint(np.clip(tex_coords, 0.0, 1.0) * 65535.0).astype(np.uint16)
+    else:
+        packed["tex_coords"] = tex_coords
+
+    packed["tangent"] = pack_snorm_10_10_10_2(verts[:, 8:11])
+    packed["bitangent"] = pack_snorm_10_10_10_2(verts[:, 11:14])
+    return positions, packed, uv_normalized
+
+
+def squared_lengths(vectors):
+    """
+    Squared length of each row of an N x 3 array, as an N x 1 column.
+    """
+    return np.einsum("ij,ij->i", vectors, vectors)[:, None]
+
+
+def normalize_rows(vectors):
+    """
+    Scale each row of an N x 3 array to unit length, leaving zero-length rows at zero.
+
+    Parameters:
+        vectors (np.ndarray): N x 3 array.
+
+    Returns:
+        np.ndarray: N x 3 array of unit (or zero) vectors.
+    """
+    # Scale by the reciprocal square root of the squared length: one einsum reduction and
+    # a multiply instead of norm's separate square, sum, sqrt and divide passes
+    squared = squared_lengths(vectors)
+    return vectors * np.where(squared < 1e-16, 1.0, 1.0 / np.sqrt(np.maximum(squared, 1e-16)))
+
+
+def fallback_tangent_frame(normals):
+    """
+    Build a tangent and bitangent perpendicular to each normal, for triangles whose
+    texture coordinates are degenerate and cannot define a tangent space.
+
+    Parameters:
+        normals (np.ndarray): N x 3 normals.
+
+    Returns:
+        tuple: (N x 3 unit tangents, N x 3 bitangents).
+    """
+    up = np.where(np.abs(normals[:, 2:3]) < 0.9, [[0.0, 0.0, 1.0]], [[0.0, 1.0, 0.0]])
+    tangents = np.cross(up, normals)
+    tangents = np.where(squared_lengths(tangents) < 1e-16, [[1.0, 0.0, 0.0]], tangents)
+    tangents = normalize_rows(tangents)
+    bitangents = np.cross(normals, tangents)
+    bitangents = np.where(squared_lengths(bitangents) < 1e-16, [[0.0, 1.0, 0.0]], bitangents)
+    return tangents, bitangents
+
+
+def index_vertices(verts):
+    """
+    Merge identical vertices of a triangle list so they can be drawn with an index buffer.
+    Unique vertices keep the order in which they first appear, so indices of neighbouring
+    triangles stay close together and the post-transform vertex cache keeps hitting.
+
+    Parameters:
+        verts (np.ndarray): N x K float32 vertex data (one row per triangle corner).
+
+    Returns:
+        tuple: (M x K unique vertices, N uint32 indices into them).
+    """
+    verts = np.ascontiguousarray(verts, dtype=np.float32)
+    # View each row as one opaque value so np.unique compares whole vertices bytewise
+    rows = verts.view(np.dtype((np.void, verts.dtype.itemsize * verts.shape[1]))).ravel()
+    _, first_index, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    # np.unique sorts by bytes; renumber the unique vertices by first appearance instead
+    order = np.argsort(first_index, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return verts[first_index[order]], rank[inverse.ravel()].astype(np.uint32)
+
+
+def optimize_vertex_cache(triangles, cache_size=32):
+    """
+    Order triangles for the GPU's post-transform vertex cache with Tom Forsyth's
+    linear-speed algorithm: a simulated LRU cache is kept, and each step emits the
+    best scoring triangle around it. Vertices score higher the more recently they
+    were used and the fewer triangles still need them, so the mesh is walked in
+    compact strips and vertices leave the cache once they are finished.
+
+    Parameters:
+        triangles (np.ndarray): T x 3 vertex indices.
+        cache_size (int): Number of entries of the simulated cache.
+
+    Returns:
+        np.ndarray: The new triangle order, a permutation of range(T).
+    """
+    triangle_count = len(triangles)
+    if triangle_count < 3:
+        return np.arange(triangle_count)
+
+    # Work on compact vertex ids so per-vertex lists only cover this batch
+    _, local = np.unique(triangles, return_inverse=True)
+    local = local.reshape(-1, 3)
+    corner_vertices = local.ravel()
+    remaining = np.bincount(corner_vertices)
+    by_vertex = np.argsort(corner_vertices, kind="stable") // 3
+    vertex_triangles = [group.tolist() for group in np.split(by_vertex, np.cumsum(remaining)[:-1])]
+    triangle_list = local.tolist()
+    remaining = remaining.tolist()
+
+    # Score tables: the three most recent entries score equally (they belong to the last
+    # triangle), older ones decay; vertices with few triangles left get a boost
+    cache_scores = [0.75] * 3 + [(1.0 - (i - 3) / (cache_size - 3)) ** 1.5 for i in range(3, cache_size)]
+    valence_scores = [0.0] + [2.0 * n**-0.5 for n in range(1, max(remaining) + 1)]
+    scores = [valence_scores[n] for n in remaining]
+
+    emitted = bytearray(triangle_count)
+    order = []
+    cache = []
+    next_unemitted = 0
+    best = int(np.argmax(np.take(scores, local).sum(axis=1)))
+    while True:
+        emitted[best] = 1
+        order.append(best)
+        if len(order) == triangle_count:
+            break
+        triangle = triangle_list[best]
+        for vertex in triangle:
+            remaining[vertex] -= 1
+            vertex_triangles[vertex].remove(best)
+
+        cache = list(dict.fromkeys(triangle + cache))
+        evicted = cache[cache_size:]
+        del cache[cache_size:]
+        for position, vertex in enumerate(cache):
+            scores[vertex] = valence_scores[remaining[vertex]] + cache_scores[position]
+        for vertex in evicted:
+            scores[vertex] = valence_scores[remaining[vertex]]
+
+        # The next triangle is the best one still touching the cache
+        best = -1
+        best_score = -1.0
+        for vertex in cache:
+            for candidate in vertex_triangles[vertex]:
+                a, b, c = triangle_list[candidate]
+                score = scores[a] + scores[b] + scores[c]
+                if score > best_score:
+                    best, best_score = candidate, score
+        if best < 0:
+            # Nothing left around the cache: continue with the next untouched triangle
+            while emitted[next_unemitted]:
+                next_unemitted += 1
+            best = next_unemitted
+    return np.array(order)
+
+
+def optimize_overdraw(triangles, positions, threshold=1.05, cache_size=16):
+    """
+    Reorder a vertex-cache-optimized triangle list so that surfaces facing away from the
+    mesh centre are drawn first. Those are the likeliest to occlude the rest of the mesh,
+    so more of the later fragments fail the depth test before shading. This follows
+    meshoptimizer's overdraw pass: the list is cut into clusters wherever the cache order
+    restarts or the running cache miss ratio is within threshold of its cluster's, and
+    whole clusters are sorted, so vertex cache efficiency is mostly kept.
+
+    Parameters:
+        triangles (np.ndarray): T x 3 vertex indices, already in vertex cache order.
+        positions (np.ndarray): Vertex positions indexed by triangles.
+        threshold (float): Largest acceptable cache miss ratio increase, e.g. 1.05 for 5%.
+        cache_size (int): Number of entries of the simulated FIFO vertex cache.
+
+    Returns:
+        np.ndarray: The new triangle order, a permutation of range(T).
+    """
+    triangle_count = len(triangles)
+    if triangle_count < 2:
+        return np.arange(triangle_count)
+
+    triangle_list = triangles.tolist()
+
+    def cache_misses(triangle, cache):
+        # Feed one triangle through a FIFO cache, returning how many corners missed
+        triangle_misses = 0
+        for vertex in triangle:
+            if vertex not in cache:
+                triangle_misses += 1
+                cache.append(vertex)
+        del cache[: max(len(cache) - cache_size, 0)]
+        return triangle_misses
+
+    # Hard boundaries where the cache order starts over (all three corners miss)
+    cache = []
+    misses = [cache_misses(triangle, cache) for triangle in triangle_list]
+    hard_starts = [t for t in range(triangle_count) if t == 0 or misses[t] == 3]
+
+    # Soft boundaries inside each hard cluster: start a new cluster, with a cold cache, as
+    # soon as the current one is within threshold of the whole cluster's miss ratio
+    starts = []
+    for start, end in zip(hard_starts, hard_starts[1:] + [triangle_count]):
+        cluster_threshold = threshold * sum(misses[start:end]) / (end - start)
+        starts.append(start)
+        cache = []
+        running_misses = 0
+        for t in range(start, end - 1):
+            running_misses += cache_misses(triangle_list[t], cache)
+            if running_misses / (t - starts[-1] + 1) <= cluster_threshold:
+                starts.append(t + 1)
+                cache = []
+                running_misses = 0
+
+    # Sort clusters by how far their area-weighted centre lies outwards along their normal
+    corners = positions[triangles].astype(np.float64)
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(face_normals, axis=1)
+    weighted_centres = corners.mean(axis=1) * areas[:, None]
+    mesh_centre = weighted_centres.sum(axis=0) / max(areas.sum(), 1e-20)
+    cluster_normals = np.add.reduceat(face_normals, starts)
+    cluster_areas = np.add.reduceat(areas, starts)
+    cluster_centres = np.add.reduceat(weighted_centres, starts) / np.maximum(cluster_areas, 1e-20)[:, None]
+    cluster_normals /= np.maximum(np.linalg.norm(cluster_normals, axis=1), 1e-20)[:, None]
+    sort_keys = np.einsum("ij,ij->i", cluster_centres - mesh_centre, cluster_normals)
+
+    bounds = starts + [triangle_count]
+    cluster_order = np.argsort(-sort_keys, kind="stable")
+    return np.concatenate([np.arange(bounds[c], bounds[c + 1]) for c in cluster_order])
+
+
+def renumber_by_first_use(verts, indices):
+    """
+    Reorder vertices into the order the index buffer first uses them, so vertex
+    fetches walk the vertex buffer front to back.
+
+    Parameters:
+        verts (np.ndarray): M x K vertex data, every row referenced by indices.
+        indices (np.ndarray): Index buffer into verts.
+
+    Returns:
+        tuple: (M x K reordered vertices, indices into them with the same dtype).
+    """
+    _, first_use = np.unique(indices, return_index=True)
+    order = np.argsort(first_use, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return verts[order], rank[indices].astype(indices.dtype)
+
+
+# ------------------------------------------------------------------------------
+# Mesh Cache
+# ------------------------------------------------------------------------------
+def mesh_cache_path(obj_path):
+    """
+    Path of the preprocessed mesh cache stored next to an .obj file.
+    """
+    return obj_path + ".fragcache.npz"
+
+
+def mesh_cache_signature(source_paths, pbr_overrides):
+    """
+    Describe everything a mesh cache was built from: the format version, the size and
+    modification time of each source file, and the PBR parameters baked into the
+    material blocks. A cache is only used if its stored signature matches exactly.
+
+    Parameters:
+        source_paths (list): The .obj file and any .mtl file it was loaded with.
+        pbr_overrides (dict): The fallback/override PBR parameters of the renderer.
+
+    Returns:
+        str: The signature.
+    """
+    sources = []
+    for path in source_paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            sources.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    return repr((MESH_CACHE_VERSION, sources, sorted(pbr_overrides.items())))
+
+
+def save_mesh_cache(cache_path, signature, mesh_material_index_map, material_key, prepared):
+    """
+    Write prepared geometry to an uncompressed .npz file. The file is written under a
+    temporary name in the same folder and then moved into place, so an interrupted
+    write or two renderers saving the same model never leave a partial cache behind.
+    Failing to write (e.g. a read-only model folder) only costs the speed-up, so it is
+    reported and ignored.
+    """
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(os.path.abspath(cache_path)), suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_path = temp_file.name
+            np.savez(
+                temp_file,
+                signature=np.array(signature),
+                mesh_material_index_map=np.array(json.dumps(mesh_material_index_map)),
+                material_key=np.frombuffer(material_key, dtype=np.uint8),
+                positions=prepared.positions,
+                attributes=prepared.attributes,
+                uv_normalized=np.array(prepared.uv_normalized),
+                indices=prepared.indices,
+                batch_materials=np.array(prepared.batch_materials, dtype=np.float32).reshape(
+                    -1, MATERIAL_BLOCK_SIZE // 4
+                ),
+                batch_ranges=np.array(prepared.batch_ranges, dtype=np.int64).reshape(-1, 2),
+            )
+        os.replace(temp_path, cache_path)
+    except OSError as error:
+        print(f"Could not write mesh cache '{cache_path}': {error}")
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_mesh_cache(cache_path, signature):
+    """
+    Read prepared geometry written by save_mesh_cache. A cache that cannot be read
+    (truncated, corrupt or from an incompatible version) is reported and deleted, so
+    the caller rebuilds it from the .obj file.
+
+    Returns:
+        tuple: (mesh_material_index_map, material key, PreparedGeometry), or None if
+               there is no cache, it is unreadable, or it was built from other inputs.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            if str(cache["signature"]) != signature:
+                return None
+            prepared = PreparedGeometry(
+                positions=cache["positions"],
+                attributes=cache["attributes"],
+                uv_normalized=bool(cache["uv_normalized"]),
+                indices=cache["indices"],
+                batch_materials=list(cache["batch_materials"]),
+                batch_ranges=[(int(first), int(count)) for first, count in cache["batch_ranges"]],
+            )
+            mesh_material_index_map = [tuple(entry) for entry in json.loads(str(cache["mesh_material_index_map"]))]
+            return mesh_material_index_map, cache["material_key"].tobytes(), prepared
+    except Exception as error:
+        # Any failure here only means the cache is unusable; never let it stop the model loading
+        print(f"Ignoring unreadable mesh cache '{cache_path}': {error}")
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+        return None
+
+
+# ------------------------------------------------------------------------------
+# Shared Geometry
+# ------------------------------------------------------------------------------
+class PreparedGeometry:
+    """
+    CPU-side vertex, index and draw batch data of one model, ready for upload.
+    """
+
+    def __init__(self, positions, attributes, uv_normalized, indices, batch_materials, batch_ranges):
+        self.positions = positions
+        self.attributes = attributes
+        self.uv_normalized = uv_normalized
+        self.indices = indices
+        # One packed MaterialBlock and one (first index, index count) range per draw batch
+        self.batch_materials = batch_materials
+        self.batch_ranges = batch_ranges
+
+
+class SharedGeometry:
+    """
+    GPU buffers of one model, shared by every ModelRenderer that loads the same file
+    with the same material parameters. VAOs are not shared: each renderer builds its
+    own, since attribute locations come from its own shader program.
+    """
+
+    def __init__(
+        self, position_vbo, attribute_vbo, ebo, uv_normalized, material_ubos, draw_batches, index_count, index_type
+    ):
+        self.position_vbo = position_vbo
+        self.attribute_vbo = attribute_vbo
+        self.ebo = ebo
+        self.uv_normalized = uv_normalized
+        self.material_ubos = material_ubos
+        # (material uniform buffer, index count, byte offset into the index buffer)
+        self.draw_batches = draw_batches
+        self.index_count = index_count
+        self.index_type = index_type
+        self.users = 0
+
+    def delete(self):
+        """
+        Delete the vertex, index and material buffers.
+        """
+        glDeleteBuffers(3, [self.position_vbo, self.attribute_vbo, self.ebo])
+        glDeleteBuffers(len(self.material_ubos), self.material_ubos)
+        gl_state.forget_uniform_buffers(self.material_ubos)
 
 
 # ------------------------------------------------------------------------------
 # ModelRenderer Class
 # ------------------------------------------------------------------------------
 class ModelRenderer(AbstractRenderer):
+    # Geometry already on the GPU, keyed by (absolute .obj path, packed material blocks)
+    shared_geometry = {}
+
     def __init__(self, renderer_name, obj_path, **kwargs):
         """
         Initialize the ModelRenderer.
 
-        Loads the .obj file (with materials and faces), parses any extra PBR data
-        from the corresponding .mtl file, and applies user-provided PBR overrides.
+        Validates the user-provided PBR overrides and starts loading the .obj file
+        (see prepare_model) on a background thread.
         """
         super().__init__(renderer_name=renderer_name, **kwargs)
         self.obj_path = obj_path
-
-        # Load the .obj file with materials and face data
-        self.object = pywavefront.Wavefront(self.obj_path, create_materials=True, collect_faces=True)
-
-        # Attempt to parse the corresponding .mtl for extra PBR extensions
-        mtl_path = self.obj_path.replace(".obj", ".mtl")
-        extra_pbr_data = parse_pbr_extensions_from_mtl(mtl_path)
-
-        # Attach extra PBR data to each material
-        for mesh in self.object.mesh_list:
-            for mat in mesh.materials:
-                mat_name = getattr(mat, "name", None)
-                if mat_name and mat_name in extra_pbr_data:
-                    mat.pbr_extensions = extra_pbr_data[mat_name]
-                else:
-                    mat.pbr_extensions = {}
+        self.fast_obj_loader = kwargs.get("fast_obj_loader", True)
+        self.mesh_cache = kwargs.get("mesh_cache", True)
 
         # Process user override PBR parameters
         override_pbr = kwargs.get("pbr_extension_overrides") or {}
-        friendly_to_token = {
-            "roughness": "Pr",
-            "metallic": "Pm",
-            "clearcoat": "Pc",
-            "clearcoat_roughness": "Pcr",
-            "sheen": "Ps",
-            "anisotropy": "aniso",
-            "anisotropy_rot": "anisor",
-            "transmission": "Tf",
-            "fresnel_exponent": "Pfe",
-        }
-        allowed_keys = set(friendly_to_token.keys())
+        allowed_keys = set(PBR_OVERRIDE_TOKENS.keys())
         invalid_keys = [key for key in override_pbr if key not in allowed_keys]
         if invalid_keys:
             raise ValueError(
@@ -247,11 +697,6 @@ class ModelRenderer(AbstractRenderer):
                 + "; available pbr overrides are: "
                 + ", ".join(sorted(allowed_keys))
             )
-        for mesh in self.object.mesh_list:
-            for mat in mesh.materials:
-                for friendly, token in friendly_to_token.items():
-                    if friendly in override_pbr:
-                        mat.pbr_extensions[token] = override_pbr[friendly]
 
         # Create fallback PBR parameters
         default_pbr = {
@@ -268,173 +713,330 @@ class ModelRenderer(AbstractRenderer):
         default_pbr.update(override_pbr)
         self.pbr_extension_overrides = default_pbr
 
+        # Parse the model and build its vertex data in the background while the rest of the
+        # scene (and the window) is set up; create_buffers waits for the result
+        self.object = None
+        self.prepared_model = model_loader.submit(self.prepare_model, override_pbr)
+
+    def prepare_model(self, override_pbr):
+        """
+        Load the .obj file (with materials and faces), attach any extra PBR data from the
+        corresponding .mtl file and the user's overrides, and build the vertex data ready
+        for upload. Runs on the model_loader thread pool, so it must not touch GL state.
+        :param override_pbr: User PBR overrides, keyed by friendly name.
+        If a mesh cache next to the .obj was built from the same files and parameters, it
+        is loaded instead and no scene is returned (None).
+        :return: (scene, mesh_material_index_map, material key, PreparedGeometry or None)
+        """
+        mtl_path = self.obj_path.replace(".obj", ".mtl")
+        if self.mesh_cache:
+            cache_path = mesh_cache_path(self.obj_path)
+            signature = mesh_cache_signature([self.obj_path, mtl_path], self.pbr_extension_overrides)
+            cached = load_mesh_cache(cache_path, signature)
+            if cached is not None:
+                return (None, *cached)
+
+        # Parse the geometry with NumPy where the file allows it and fall back to pywavefront otherwise
+        scene = None
+        if self.fast_obj_loader:
+            scene = fast_obj_load(self.obj_path, collect_faces=True)
+        if scene is None:
+            scene = pywavefront.Wavefront(self.obj_path, create_materials=True, collect_faces=True)
+
+        # Attempt to parse the corresponding .mtl for extra PBR extensions
+        extra_pbr_data = parse_pbr_extensions_from_mtl(mtl_path)
+
+        # Attach extra PBR data and user overrides to each material
+        for mesh in scene.mesh_list:
+            for mat in mesh.materials:
+                mat_name = getattr(mat, "name", None)
+                if mat_name and mat_name in extra_pbr_data:
+                    mat.pbr_extensions = extra_pbr_data[mat_name]
+                else:
+                    mat.pbr_extensions = {}
+                for friendly, token in PBR_OVERRIDE_TOKENS.items():
+                    if friendly in override_pbr:
+                        mat.pbr_extensions[token] = override_pbr[friendly]
+
+        mesh_material_index_map = []
+        vertex_sources = []
+        material_blocks = []
+        for mesh_index, mesh in enumerate(scene.mesh_list):
+            for material in mesh.materials:
+                vertices = material.vertices
+                if not len(vertices):
+                    print(f"Material '{material.name}' in mesh '{mesh.name}' has no vertices. Skipping.")
+                    continue
+
+                vertex_sources.append(vertices)
+                material_blocks.append(pack_material_block(material, self.pbr_extension_overrides))
+                mesh_material_index_map.append((mesh_index, material.name))
+
+        if not vertex_sources:
+            return scene, mesh_material_index_map, None, None
+        # Material parameters decide how vertex ranges are grouped, so they are part of the sharing key
+        material_key = b"".join(block.tobytes() for block in material_blocks)
+        prepared = self.prepare_geometry(vertex_sources, material_blocks)
+        if self.mesh_cache:
+            save_mesh_cache(cache_path, signature, mesh_material_index_map, material_key, prepared)
+        return scene, mesh_material_index_map, material_key, prepared
+
     # --------------------------------------------------------------------------
     # Shadow Mapping Support
     # --------------------------------------------------------------------------
     def supports_shadow_mapping(self):
         return True
 
+    def init_shaders(self):
+        """
+        Initialize the shader programs and make sure the main program declares the
+        MaterialBlock the per-material uniform buffers are bound to.
+        """
+        super().init_shaders()
+        if self.material_ubo is None:
+            raise RuntimeError("Uniform block not found in shader program: MaterialBlock")
+
     # --------------------------------------------------------------------------
     # Buffer Creation
     # --------------------------------------------------------------------------
     def create_buffers(self):
         """
-        Create buffers (VBOs and VAOs) for each material in every mesh.
+        Create this renderer's VAO over the model's shared geometry: one indexed set of VBOs
+        holding the vertices of every material in every mesh, with one contiguous index
+        range (draw batch) per distinct material. Renderers loading the same file with the
+        same materials reuse the buffers built by the first one.
         """
         self.vaos = []
-        self.vbos = []
-        self.mesh_material_index_map = []
+        self.geometry = None
+        # Re-raises here if loading failed on the worker thread
+        self.object, self.mesh_material_index_map, material_key, prepared = self.prepared_model.result()
+        self.prepared_model = None
+        if prepared is None:
+            return
 
-        for mesh_index, mesh in enumerate(self.object.mesh_list):
-            for material in mesh.materials:
-                vertices = material.vertices
-                if not vertices:
-                    print(f"Material '{material.name}' in mesh '{mesh.name}' has no vertices. Skipping.")
-                    continue
+        self.geometry_key = (os.path.abspath(self.obj_path), material_key)
+        geometry = ModelRenderer.shared_geometry.get(self.geometry_key)
+        if geometry is None:
+            geometry = self.upload_geometry(prepared)
+            ModelRenderer.shared_geometry[self.geometry_key] = geometry
+        geometry.users += 1
+        self.geometry = geometry
 
-                vertices_array = np.array(vertices, dtype=np.float32).reshape(-1, 8)
-                # Reorder the vertex components:
-                #   [x, y, z, nx, ny, nz, u, v] -> [x, y, z, nx, ny, nz, u, v]
-                # But here, reordering is performed as follows:
-                reordered = np.column_stack(
-                    (
-                        vertices_array[:, 5],  # x
-                        vertices_array[:, 6],  # y
-                        vertices_array[:, 7],  # z
-                        vertices_array[:, 2],  # nx
-                        vertices_array[:, 3],  # ny
-                        vertices_array[:, 4],  # nz
-                        vertices_array[:, 0],  # u
-                        vertices_array[:, 1],  # v
-                    )
-                )
-                # Compute tangent and bitangent vectors and append them
-                reordered = self.compute_tangents_and_bitangents(reordered)
-                vbo = self.create_vbo(reordered)
-                vao = self.create_vao(with_tangents=True)
-                self.vbos.append(vbo)
-                self.vaos.append(vao)
-                self.mesh_material_index_map.append((mesh_index, material.name))
-
-    def compute_tangents_and_bitangents(self, verts):
+        self.vaos.append(
+            self.create_vao(
+                geometry.position_vbo,
+                geometry.attribute_vbo,
+                geometry.ebo,
+                with_tangents=True,
+                uv_normalized=geometry.uv_normalized,
+            )
+        )
+
+    def prepare_geometry(self, vertex_sources, material_blocks):
+        """
+        Build the upload-ready vertex, index and draw batch data for a model. CPU only.
+        :param vertex_sources: T2F_N3F_V3F vertex data of each material range.
+        :param material_blocks: The packed MaterialBlock of each material range.
+        :return: PreparedGeometry
+        """
+        # Sort the vertex ranges once by material (in order of first appearance), so all
+        # ranges with identical parameters sit next to each other in the shared buffers and
+        # each distinct material becomes one uniform buffer bind and one contiguous draw
+        material_groups = {}
+        for vertices, material_block in zip(vertex_sources, material_blocks):
+            if isinstance(vertices, np.ndarray):
+                # The fast OBJ loader already produces float32 arrays
+                vertices_array = vertices.reshape(-1, 8)
+            else:
+                # pywavefront hands back a flat Python list; fromiter with a known count
+                # fills a preallocated float32 buffer without an intermediate object array
+                vertices_array = np.fromiter(vertices, dtype=np.float32, count=len(vertices)).reshape(-1, 8)
+            material_groups.setdefault(material_block.tobytes(), (material_block, []))[1].append(vertices_array)
+
+        sorted_blocks = []
+        batch_materials = []
+        batch_ranges = []
+        first = 0
+        for material_block, group_blocks in material_groups.values():
+            count = sum(len(vertex_block) for vertex_block in group_blocks)
+            batch_materials.append(material_block)
+            batch_ranges.append((first, count))
+            sorted_blocks.extend(group_blocks)
+            first += count
+
+        # Triangle corners that share position, normal and UV become one indexed vertex,
+        # so each is fetched and shaded once; draw batches become ranges of the index buffer
+        unique_vertices, indices = index_vertices(gather_t2f_n3f_v3f(sorted_blocks))
+        # Reorder each batch's triangles for the post-transform vertex cache and then to cut
+        # overdraw, and renumber the vertices to match the new first-use order
+        positions = unique_vertices[:, 0:3]
+        for first, count in batch_ranges:
+            batch = indices[first : first + count].reshape(-1, 3)
+            batch = batch[optimize_vertex_cache(batch)]
+            indices[first : first + count] = batch[optimize_overdraw(batch, positions)].ravel()
+        unique_vertices, indices = renumber_by_first_use(unique_vertices, indices)
+        if len(unique_vertices) <= 0xFFFF:
+            indices = indices.astype(np.uint16)
+
+        # Compute tangent and bitangent vectors and append them; shared vertices
+        # accumulate the contributions of every triangle that uses them
+        vertices = self.compute_tangents_and_bitangents(unique_vertices, indices)
+        positions, attributes, uv_normalized = pack_vertex_data(vertices)
+        return PreparedGeometry(positions, attributes, uv_normalized, indices, batch_materials, batch_ranges)
+
+    def upload_geometry(self, prepared):
+        """
+        Upload prepared geometry and its material blocks into GPU buffers.
+        :param prepared: PreparedGeometry from prepare_geometry.
+        :return: SharedGeometry
+        """
+        indices = prepared.indices
+        material_ubos = [create_uniform_buffer(material_block) for material_block in prepared.batch_materials]
+        # Resolve each batch to its final draw arguments once, so render only unpacks
+        # tuples instead of rebuilding byte offsets and pointer objects every frame
+        draw_batches = tuple(
+            (ubo, count, ctypes.c_void_p(first * indices.itemsize))
+            for ubo, (first, count) in zip(material_ubos, prepared.batch_ranges)
+        )
+        return SharedGeometry(
+            position_vbo=self.create_vbo(prepared.positions),
+            attribute_vbo=self.create_vbo(prepared.attributes),
+            # Buffer objects are untyped, so the index data can be uploaded through
+            # GL_ARRAY_BUFFER and only bound as GL_ELEMENT_ARRAY_BUFFER inside each VAO
+            ebo=self.create_vbo(indices),
+            uv_normalized=prepared.uv_normalized,
+            material_ubos=material_ubos,
+            draw_batches=draw_batches,
+            index_count=len(indices),
+            index_type=GL_UNSIGNED_SHORT if indices.dtype == np.uint16 else GL_UNSIGNED_INT,
+        )
+
+    def compute_tangents_and_bitangents(self, verts, indices=None):
         """
         Compute tangent and bitangent vectors for an N x 8 array of vertices.
+        If indices are given, triangles are read through them; otherwise every three
+        consecutive vertices form a triangle.
         Returns an N x 14 array with appended tangent and bitangent vectors.
         """
-        tangent = np.zeros((verts.shape[0], 3), dtype=np.float32)
-        bitangent = np.zeros((verts.shape[0], 3), dtype=np.float32)
-        num_triangles = verts.shape[0] // 3
-
-        for i in range(num_triangles):
-            i0, i1, i2 = i * 3, i * 3 + 1, i * 3 + 2
-            v0, v1, v2 = verts[i0], verts[i1], verts[i2]
-            pos0, pos1, pos2 = v0[0:3], v1[0:3], v2[0:3]
-            uv0, uv1, uv2 = v0[6:8], v1[6:8], v2[6:8]
-            deltaPos1 = pos1 - pos0
-            deltaPos2 = pos2 - pos0
-            deltaUV1 = uv1 - uv0
-            deltaUV2 = uv2 - uv0
-
-            denom = deltaUV1[0] * deltaUV2[1] - deltaUV1[1] * deltaUV2[0]
-            if abs(denom) < 1e-8:
-                N = v0[3:6]
-                fallbackT = np.cross([0, 0, 1], N) if abs(N[2]) < 0.9 else np.cross([0, 1, 0], N)
-                if np.linalg.norm(fallbackT) < 1e-8:
-                    fallbackT = [1, 0, 0]
-                fallbackT = fallbackT / np.linalg.norm(fallbackT)
-                fallbackB = np.cross(N, fallbackT)
-                if np.linalg.norm(fallbackB) < 1e-8:
-                    fallbackB = [0, 1, 0]
-                T, B = fallbackT, fallbackB
-            else:
-                r = 1.0 / denom
-                T = (deltaPos1 * deltaUV2[1] - deltaPos2 * deltaUV1[1]) * r
-                B = (deltaPos2 * deltaUV1[0] - deltaPos1 * deltaUV2[0]) * r
-
-            tangent[i0] += T
-            tangent[i1] += T
-            tangent[i2] += T
-            bitangent[i0] += B
-            bitangent[i1] += B
-            bitangent[i2] += B
-
-        for i in range(verts.shape[0]):
-            N = verts[i, 3:6]
-            T = tangent[i]
-            B = bitangent[i]
-            T = T - N * np.dot(N, T)
-            if np.linalg.norm(T) < 1e-8:
-                T = np.cross([0, 0, 1], N) if abs(N[2]) < 0.9 else np.cross([0, 1, 0], N)
-            T = T / np.linalg.norm(T)
-            B = B - N * np.dot(N, B) - T * np.dot(T, B)
-            if np.linalg.norm(B) < 1e-8:
-                B = np.cross(N, T)
-                if np.linalg.norm(B) < 1e-8:
-                    B = [0, 1, 0]
-            B = B / np.linalg.norm(B)
-            if np.dot(np.cross(N, T), B) < 0.0:
-                B = -B
-            tangent[i] = T
-            bitangent[i] = B
-
-        final_array = np.hstack((verts, tangent, bitangent)).astype(np.float32)
+        # Build the result in place: the input columns first, then tangents and bitangents
+        # accumulated straight into their column views, so no final hstack copy is needed
+        final_array = np.empty((verts.shape[0], 14), dtype=np.float32)
+        final_array[:, 0:8] = verts
+        tangent = final_array[:, 8:11]
+        bitangent = final_array[:, 11:14]
+        if indices is None:
+            indices = np.arange(verts.shape[0])
+        triangles = np.asarray(indices, dtype=np.intp)[: len(indices) // 3 * 3].reshape(-1, 3)
+
+        # Edge and UV deltas of every triangle at once: (num_triangles, 3) and (num_triangles, 2)
+        corners = verts[triangles]
+        deltaPos1 = corners[:, 1, 0:3] - corners[:, 0, 0:3]
+        deltaPos2 = corners[:, 2, 0:3] - corners[:, 0, 0:3]
+        deltaUV1 = corners[:, 1, 6:8] - corners[:, 0, 6:8]
+        deltaUV2 = corners[:, 2, 6:8] - corners[:, 0, 6:8]
+
+        denom = deltaUV1[:, 0] * deltaUV2[:, 1] - deltaUV1[:, 1] * deltaUV2[:, 0]
+        degenerate = np.abs(denom) < 1e-8
+        r = 1.0 / np.where(degenerate, 1.0, denom)
+        T = (deltaPos1 * deltaUV2[:, 1:2] - deltaPos2 * deltaUV1[:, 1:2]) * r[:, None]
+        B = (deltaPos2 * deltaUV1[:, 0:1] - deltaPos1 * deltaUV2[:, 0:1]) * r[:, None]
+
+        # Triangles without usable UVs get a frame built around the first corner's normal
+        if np.any(degenerate):
+            N = corners[degenerate, 0, 3:6]
+            fallbackT, fallbackB = fallback_tangent_frame(N)
+            T[degenerate] = fallbackT
+            B[degenerate] = fallbackB
+
+        # Scatter each triangle's vectors onto its three corners, summing over shared vertices.
+        # np.bincount per axis is a plain C reduction, several times faster than np.add.at
+        corner_vertices = triangles.ravel()
+        corner_T = np.repeat(T, 3, axis=0)
+        corner_B = np.repeat(B, 3, axis=0)
+        for axis in range(3):
+            tangent[:, axis] = np.bincount(corner_vertices, weights=corner_T[:, axis], minlength=verts.shape[0])
+            bitangent[:, axis] = np.bincount(corner_vertices, weights=corner_B[:, axis], minlength=verts.shape[0])
+
+        # Orthonormalize every vertex's frame against its normal (Gram-Schmidt) in bulk
+        N = verts[:, 3:6]
+        T = tangent - N * np.einsum("ij,ij->i", N, tangent)[:, None]
+        up = np.where(np.abs(N[:, 2:3]) < 0.9, [[0.0, 0.0, 1.0]], [[0.0, 1.0, 0.0]])
+        T = np.where(squared_lengths(T) < 1e-16, np.cross(up, N), T)
+        T = normalize_rows(T)
+
+        B = (
+            bitangent
+            - N * np.einsum("ij,ij->i", N, bitangent)[:, None]
+            - T * np.einsum("ij,ij->i", T, bitangent)[:, None]
+        )
+        B = np.where(squared_lengths(B) < 1e-16, np.cross(N, T), B)
+        B = np.where(squared_lengths(B) < 1e-16, [[0.0, 1.0, 0.0]], B)
+        B = normalize_rows(B)
+        # Keep the frame right-handed with respect to the normal
+        handedness = np.einsum("ij,ij->i", np.cross(N, T), B)
+        tangent[:] = T
+        bitangent[:] = np.where(handedness[:, None] < 0.0, -B, B)
         return final_array
 
     def create_vbo(self, vertices_array):
         """
-        Create and bind a Vertex Buffer Object (VBO) for the given vertex array.
+        Create a Vertex Buffer Object (VBO) holding the given vertex array.
         """
-        vbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices_array.nbytes, vertices_array, GL_STATIC_DRAW)
-        return vbo
+        return gl_state.create_static_buffer(vertices_array)
 
-    def create_vao(self, with_tangents=False):
+    def create_vao(self, position_vbo, attribute_vbo, ebo, with_tangents=False, uv_normalized=True):
         """
-        Create and set up a Vertex Array Object (VAO) with optional tangent/bitangent attributes.
+        Create and set up a Vertex Array Object (VAO) reading positions from one VBO and
+        PACKED_ATTRIBUTE_DTYPE (or FLOAT_UV_ATTRIBUTE_DTYPE) data from another, indexed
+        through ebo, with optional tangent/bitangent attributes.
+        :param uv_normalized: True if texture coordinates are unorm16, False if float32.
         """
+        shader_program = self.shader_engine.shader_program
         vao = glGenVertexArrays(1)
-        glBindVertexArray(vao)
-        vertex_stride = 14 * self.float_size if with_tangents else 8 * self.float_size
+        gl_state.bind_vao(vao)
 
-        position_loc = glGetAttribLocation(self.shader_engine.shader_program, "position")
-        normal_loc = glGetAttribLocation(self.shader_engine.shader_program, "normal")
-        tex_coords_loc = glGetAttribLocation(self.shader_engine.shader_program, "texCoords")
-        tangent_loc = glGetAttribLocation(self.shader_engine.shader_program, "tangent")
-        bitangent_loc = glGetAttribLocation(self.shader_engine.shader_program, "bitangent")
+        # The element buffer binding is VAO state, so it must be made while this VAO is bound
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+        attribute_dtype = PACKED_ATTRIBUTE_DTYPE if uv_normalized else FLOAT_UV_ATTRIBUTE_DTYPE
+        attribute_stride = attribute_dtype.itemsize
+        fields = attribute_dtype.fields
 
+        position_loc = self.shader_engine.get_attribute_location(shader_program, "position")
+        normal_loc = self.shader_engine.get_attribute_location(shader_program, "normal")
+        tex_coords_loc = self.shader_engine.get_attribute_location(shader_program, "texCoords")
+        tangent_loc = self.shader_engine.get_attribute_location(shader_program, "tangent")
+        bitangent_loc = self.shader_engine.get_attribute_location(shader_program, "bitangent")
+
+        packed_normal = (GL_INT_2_10_10_10_REV, GL_TRUE)
+        tex_coords_format = (GL_UNSIGNED_SHORT, GL_TRUE) if uv_normalized else (GL_FLOAT, GL_FALSE)
+
+        # Attribute pointers capture the buffer bound to GL_ARRAY_BUFFER at the time of the call
+        glBindBuffer(GL_ARRAY_BUFFER, position_vbo)
         if position_loc >= 0:
-            self.enable_vertex_attrib(position_loc, 3, vertex_stride, 0)
+            self.enable_vertex_attrib(position_loc, 3, 3 * self.float_size, 0)
+
+        glBindBuffer(GL_ARRAY_BUFFER, attribute_vbo)
         if normal_loc >= 0:
-            self.enable_vertex_attrib(normal_loc, 3, vertex_stride, 3 * self.float_size)
+            self.enable_vertex_attrib(normal_loc, 4, attribute_stride, fields["normal"][1], *packed_normal)
         if tex_coords_loc >= 0:
-            self.enable_vertex_attrib(tex_coords_loc, 2, vertex_stride, 6 * self.float_size)
+            self.enable_vertex_attrib(tex_coords_loc, 2, attribute_stride, fields["tex_coords"][1], *tex_coords_format)
         if with_tangents:
             if tangent_loc >= 0:
-                self.enable_vertex_attrib(tangent_loc, 3, vertex_stride, 8 * self.float_size)
+                self.enable_vertex_attrib(tangent_loc, 4, attribute_stride, fields["tangent"][1], *packed_normal)
             if bitangent_loc >= 0:
-                self.enable_vertex_attrib(bitangent_loc, 3, vertex_stride, 11 * self.float_size)
+                self.enable_vertex_attrib(bitangent_loc, 4, attribute_stride, fields["bitangent"][1], *packed_normal)
 
         glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindVertexArray(0)
+        gl_state.bind_vao(0)
         return vao
 
-    def get_vertex_stride(self, vertex_format):
-        """
-        Compute the vertex stride (number of components) from the vertex format string.
-        """
-        count = 0
-        for part in vertex_format.split("_"):
-            count += int(part[1])
-        return count
-
-    def enable_vertex_attrib(self, location, size, stride, pointer_offset):
+    def enable_vertex_attrib(self, location, size, stride, pointer_offset, gl_type=GL_FLOAT, normalized=GL_FALSE):
         """
         Enable and set the vertex attribute pointer.
         """
         if location >= 0:
             glEnableVertexAttribArray(location)
-            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(pointer_offset))
+            glVertexAttribPointer(location, size, gl_type, normalized, stride, ctypes.c_void_p(pointer_offset))
 
     # --------------------------------------------------------------------------
     # Rendering Methods
@@ -442,33 +1044,25 @@ class ModelRenderer(AbstractRenderer):
     @with_gl_render_state
     def render(self):
         """
-        Render all meshes of the object using their corresponding materials.
-        """
-        vao_counter = 0
-        for mesh_index, mesh in enumerate(self.object.mesh_list):
-            for material in mesh.materials:
-                vertices = material.vertices
-                if not vertices:
-                    continue
-                self.apply_material(material)
-                count = len(vertices) // self.get_vertex_stride(material.vertex_format)
-                self.bind_and_draw_vao(vao_counter, count)
-                vao_counter += 1
-
-    def apply_material(self, material):
-        """
-        Upload the material uniforms to the GPU.
+        Render all meshes of the object, issuing one draw call per distinct material.
         """
-        glUseProgram(self.shader_engine.shader_program)
-        upload_material_uniforms(self.shader_engine.shader_program, material, self.pbr_extension_overrides)
+        if not self.vaos:
+            return
+        gl_state.bind_vao(self.vaos[0])
+        index_type = self.geometry.index_type
+        for ubo, count, offset in self.geometry.draw_batches:
+            gl_state.bind_uniform_buffer(MATERIAL_BLOCK_BINDING, ubo)
+            glDrawElements(GL_TRIANGLES, count, index_type, offset)
 
-    def bind_and_draw_vao(self, vao_index, count):
+    def draw_from_light(self):
         """
-        Bind the VAO at the given index and issue the draw call.
+        Draw the whole model for the shadow pass. Materials don't matter there,
+        so every range is covered by a single draw call.
         """
-        glBindVertexArray(self.vaos[vao_index])
-        glDrawArrays(GL_TRIANGLES, 0, count)
-        glBindVertexArray(0)
+        if not self.vaos:
+            return
+        gl_state.bind_vao(self.vaos[0])
+        glDrawElements(GL_TRIANGLES, self.geometry.index_count, self.geometry.index_type, None)
 
     # --------------------------------------------------------------------------
     # Shutdown and Resource Cleanup
@@ -479,8 +1073,15 @@ class ModelRenderer(AbstractRenderer):
         """
         if hasattr(self, "vaos") and self.vaos:
             glDeleteVertexArrays(len(self.vaos), self.vaos)
-        if hasattr(self, "vbos") and self.vbos:
-            glDeleteBuffers(len(self.vbos), self.vbos)
-        if hasattr(self, "ebos") and self.ebos:
-            glDeleteBuffers(len(self.ebos), self.ebos)
+            gl_state.forget_vaos(self.vaos)
+        if getattr(self, "geometry", None) is not None:
+            # The buffers go away with the last renderer using them
+            self.geometry.users -= 1
+            if self.geometry.users == 0:
+                self.geometry.delete()
+                del ModelRenderer.shared_geometry[self.geometry_key]
+            self.geometry = None
+        if self.material_ubo:
+            glDeleteBuffers(1, [self.material_ubo])
+            gl_state.forget_uniform_buffers([self.material_ubo])
         self.shader_engine.delete_shader_programs()
@@ -0,0 +1,147 @@
+# ------------------------------------------------------------------------------
+# Imports
+# ------------------------------------------------------------------------------
+import os
+
+import numpy as np
+import pywavefront
+from pywavefront.material import Material, MaterialParser
+from pywavefront.mesh import Mesh
+
+
+# ------------------------------------------------------------------------------
+# Fast OBJ Loading
+# ------------------------------------------------------------------------------
+def parse_floats(lines, components):
+    """
+    Parse the values of a list of 'v'/'vt'/'vn' lines in one NumPy call.
+
+    Parameters:
+        lines (list): Line payloads (bytes, without the statement keyword).
+        components (int): Number of values expected per line.
+
+    Returns:
+        np.ndarray: len(lines) x components float32 array, or None if any line
+                    has a different number of values.
+    """
+    if not lines:
+        return np.empty((0, components), dtype=np.float32)
+    values = np.array(b" ".join(lines).split(), dtype=np.float32)
+    if values.size != len(lines) * components:
+        return None
+    return values.reshape(-1, components)
+
+
+def triangulate_face(corners):
+    """
+    Split a polygon into triangles the same way pywavefront does:
+    (v1, v2, v3), then (v_j, v1, v_{j-1}) for every further vertex v_j.
+
+    Parameters:
+        corners (list): The face's vertex tokens (e.g. b"1/2/3").
+
+    Returns:
+        list: Corner tokens of the triangles, three per triangle.
+    """
+    triangles = corners[:3]
+    for j in range(3, len(corners)):
+        triangles += (corners[j], corners[0], corners[j - 1])
+    return triangles
+
+
+def fast_obj_load(obj_path, collect_faces=False):
+    """
+    Load an .obj file into a pywavefront.Wavefront, parsing the geometry with NumPy
+    instead of pywavefront's per-value Python parser. Materials still come from
+    pywavefront's .mtl parser, and meshes/materials are filled in exactly as
+    pywavefront would (interleaved T2F_N3F_V3F vertices per material), except that
+    material.vertices is a float32 array rather than a list.
+
+    Only files whose faces all reference a position, texture coordinate and normal
+    ("v/vt/vn") by absolute index and whose vertices have three components are handled;
+    anything else returns None so the caller can fall back to pywavefront.
+
+    Parameters:
+        obj_path (str): Path to the .obj file.
+        collect_faces (bool): Also fill mesh.faces with triangle position indices.
+
+    Returns:
+        pywavefront.Wavefront or None
+    """
+    with open(obj_path, "rb") as obj_file:
+        lines = obj_file.read().splitlines()
+
+    scene = pywavefront.Wavefront(obj_path, create_materials=True, collect_faces=collect_faces, parse=False)
+    position_lines, tex_coord_lines, normal_lines = [], [], []
+    # Each entry: (material, mesh, triangle corner tokens); consecutive faces share an entry
+    face_runs = []
+    mesh = None
+    material = None
+    run = None
+
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == ord("#"):
+            continue
+        keyword, _, payload = line.partition(b" ")
+        payload = payload.strip()
+
+        if keyword == b"v":
+            position_lines.append(payload)
+        elif keyword == b"vt":
+            # Only u and v are used; an optional w is dropped
+            tex_coord_lines.append(b" ".join(payload.split()[:2]))
+        elif keyword == b"vn":
+            normal_lines.append(payload)
+        elif keyword == b"f":
+            if run is None:
+                if material is None:
+                    material = Material(f"default{len(scene.materials)}", is_default=True, has_faces=collect_faces)
+                    scene.materials[material.name] = material
+                if mesh is None:
+                    mesh = Mesh(has_faces=collect_faces)
+                    scene.add_mesh(mesh)
+                mesh.add_material(material)
+                run = (material, mesh, [])
+                face_runs.append(run)
+            corners = payload.split()
+            if any(corner.count(b"/") != 2 or b"//" in corner or b"-" in corner for corner in corners):
+                return None
+            run[2].extend(triangulate_face(corners))
+            continue
+        elif keyword == b"o":
+            mesh = Mesh(payload.decode(), has_faces=collect_faces)
+            scene.add_mesh(mesh)
+        elif keyword == b"mtllib":
+            mtl_path = os.path.join(os.path.dirname(obj_path), payload.decode())
+            if os.path.exists(mtl_path):
+                scene.materials.update(MaterialParser(mtl_path, collect_faces=collect_faces).materials)
+                scene.mtllibs.append(payload.decode())
+        elif keyword in (b"usemtl", b"usemat"):
+            name = payload.decode()
+            material = scene.materials.get(name)
+            if material is None:
+                material = Material(name, is_default=True, has_faces=collect_faces)
+                scene.materials[name] = material
+            if mesh is not None:
+                mesh.add_material(material)
+        run = None
+
+    positions = parse_floats(position_lines, 3)
+    tex_coords = parse_floats(tex_coord_lines, 2)
+    normals = parse_floats(normal_lines, 3)
+    if positions is None or tex_coords is None or normals is None:
+        return None
+
+    scene.vertices = positions
+    for material, mesh, corners in face_runs:
+        # "v/vt/vn" tokens -> N x 3 zero-based indices
+        indices = np.array(b" ".join(corners).replace(b"/", b" ").split(), dtype=np.int64).reshape(-1, 3) - 1
+
+        vertices = np.hstack((tex_coords[indices[:, 1]], normals[indices[:, 2]], positions[indices[:, 0]])).ravel()
+        material.vertex_format = "T2F_N3F_V3F"
+        material.vertices = vertices if not len(material.vertices) else np.concatenate((material.vertices, vertices))
+        if collect_faces:
+            mesh.faces += indices[:, 0].reshape(-1, 3).tolist()
+
+    return scene
@@ -8,6 +8,9 @@ import numpy as np
 from OpenGL.GL import *
 
 from components.abstract_renderer import AbstractRenderer, with_gl_render_state
+from components.gl_state import GLState
+
+gl_state = GLState()
 
 
 # ------------------------------------------------------------------------------
@@ -239,6 +242,8 @@ class ParticleRenderer(AbstractRenderer):
             if not glGetProgramiv(self.shader_engine.shader_program, GL_LINK_STATUS):
                 log = glGetProgramInfoLog(self.shader_engine.shader_program)
                 raise RuntimeError(f"Shader program linking failed: {log.decode()}")
+            # Relinking may move uniforms, so locations looked up before it are stale
+            self.shader_engine.cache_uniform_locations(self.shader_engine.shader_program)
 
     def supports_shadow_mapping(self):
         return False
@@ -249,10 +254,12 @@ class ParticleRenderer(AbstractRenderer):
         position and model matrix, to the shader.
         """
         self.setup_camera()
-        view_location = glGetUniformLocation(self.shader_engine.shader_program, "view")
-        projection_location = glGetUniformLocation(self.shader_engine.shader_program, "projection")
-        camera_position_location = glGetUniformLocation(self.shader_engine.shader_program, "cameraPosition")
-        model_matrix_location = glGetUniformLocation(self.shader_engine.shader_program, "model")
+        view_location = self.shader_engine.get_uniform_location(self.shader_engine.shader_program, "view")
+        projection_location = self.shader_engine.get_uniform_location(self.shader_engine.shader_program, "projection")
+        camera_position_location = self.shader_engine.get_uniform_location(
+            self.shader_engine.shader_program, "cameraPosition"
+        )
+        model_matrix_location = self.shader_engine.get_uniform_location(self.shader_engine.shader_program, "model")
         glUniformMatrix4fv(view_location, 1, GL_FALSE, glm.value_ptr(self.view))
         glUniformMatrix4fv(projection_location, 1, GL_FALSE, glm.value_ptr(self.projection))
         glUniform3fv(camera_position_location, 1, glm.value_ptr(self.camera_position))
@@ -394,12 +401,12 @@ class ParticleRenderer(AbstractRenderer):
         self.shader_engine.use_shader_program()
         self.vao = glGenVertexArrays(1)
         self.vbo = glGenBuffers(1)
-        glBindVertexArray(self.vao)
+        gl_state.bind_vao(self.vao)
         buffer_size = self.max_particles * self.particle_byte_size_cpu
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
         glBufferData(GL_ARRAY_BUFFER, buffer_size, None, GL_DYNAMIC_DRAW)
         self._setup_vertex_attributes_cpu()
-        glBindVertexArray(0)
+        gl_state.bind_vao(0)
 
     # --------------------------------------------------------------------------
     # Buffer Creation for Transform Feedback and Compute Shader Modes
@@ -416,10 +423,10 @@ class ParticleRenderer(AbstractRenderer):
             glBufferData(GL_ARRAY_BUFFER, self.buffer_size_tf_compute, particle_data, GL_DYNAMIC_DRAW)
         glBindBuffer(GL_ARRAY_BUFFER, 0)
         self.vao = glGenVertexArrays(1)
-        glBindVertexArray(self.vao)
+        gl_state.bind_vao(self.vao)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbos[0])
         self._setup_vertex_attributes()
-        glBindVertexArray(0)
+        gl_state.bind_vao(0)
 
     def setup_compute_shader_buffers(self, particle_data):
         """
@@ -440,9 +447,9 @@ class ParticleRenderer(AbstractRenderer):
         glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 1, self.generation_data_buffer)
         glBindBuffer(GL_SHADER_STORAGE_BUFFER, 0)
         self.vao = glGenVertexArrays(1)
-        glBindVertexArray(self.vao)
+        gl_state.bind_vao(self.vao)
         glBindBuffer(GL_ARRAY_BUFFER, self.ssbo)
-        glBindVertexArray(0)
+        gl_state.bind_vao(0)
 
     # --------------------------------------------------------------------------
     # Vertex Attribute Setup Methods
@@ -453,13 +460,15 @@ class ParticleRenderer(AbstractRenderer):
         """
         vertex_stride = self.stride_length_tf_compute * self.float_size
         self.shader_engine.use_shader_program()
-        position_loc = glGetAttribLocation(self.shader_engine.shader_program, "position")
-        velocity_loc = glGetAttribLocation(self.shader_engine.shader_program, "velocity")
-        spawn_time_loc = glGetAttribLocation(self.shader_engine.shader_program, "spawnTime")
-        lifetime_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleLifetime")
-        particle_id_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleID")
-        weight_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleWeight")
-        lifetime_percentage_loc = glGetAttribLocation(self.shader_engine.shader_program, "lifetimePercentage")
+        position_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "position")
+        velocity_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "velocity")
+        spawn_time_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "spawnTime")
+        lifetime_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "particleLifetime")
+        particle_id_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "particleID")
+        weight_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "particleWeight")
+        lifetime_percentage_loc = self.shader_engine.get_attribute_location(
+            self.shader_engine.shader_program, "lifetimePercentage"
+        )
         if (
             position_loc == -1
             or velocity_loc == -1
@@ -502,13 +511,17 @@ class ParticleRenderer(AbstractRenderer):
         """
         Debug function to print vertex attribute pointer setup details.
         """
-        position_loc = glGetAttribLocation(self.shader_engine.shader_program, "position")
-        velocity_loc = glGetAttribLocation(self.shader_engine.shader_program, "velocity")
-        spawn_time_loc = glGetAttribLocation(self.shader_engine.shader_program, "spawnTime")
-        lifetime_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleLifetime")
-        particle_id_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleID")
-        particle_weight_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleWeight")
-        lifetime_percentage_loc = glGetAttribLocation(self.shader_engine.shader_program, "lifetimePercentage")
+        position_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "position")
+        velocity_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "velocity")
+        spawn_time_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "spawnTime")
+        lifetime_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "particleLifetime")
+        particle_id_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "particleID")
+        particle_weight_loc = self.shader_engine.get_attribute_location(
+            self.shader_engine.shader_program, "particleWeight"
+        )
+        lifetime_percentage_loc = self.shader_engine.get_attribute_location(
+            self.shader_engine.shader_program, "lifetimePercentage"
+        )
         pos_stride = glGetVertexAttribiv(position_loc, GL_VERTEX_ATTRIB_ARRAY_STRIDE)
         vel_stride = glGetVertexAttribiv(velocity_loc, GL_VERTEX_ATTRIB_ARRAY_STRIDE)
         spawn_stride = glGetVertexAttribiv(spawn_time_loc, GL_VERTEX_ATTRIB_ARRAY_STRIDE)
@@ -538,9 +551,11 @@ class ParticleRenderer(AbstractRenderer):
         """
         vertex_stride = self.stride_length_cpu * self.float_size
         self.shader_engine.use_shader_program()
-        position_loc = glGetAttribLocation(self.shader_engine.shader_program, "position")
-        lifetime_percentage_loc = glGetAttribLocation(self.shader_engine.shader_program, "lifetimePercentage")
-        particle_id_loc = glGetAttribLocation(self.shader_engine.shader_program, "particleID")
+        position_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "position")
+        lifetime_percentage_loc = self.shader_engine.get_attribute_location(
+            self.shader_engine.shader_program, "lifetimePercentage"
+        )
+        particle_id_loc = self.shader_engine.get_attribute_location(self.shader_engine.shader_program, "particleID")
         if position_loc == -1 or lifetime_percentage_loc == -1 or particle_id_loc == -1:
             raise RuntimeError("Required attributes not found in shader program for CPU mode.")
         glEnableVertexAttribArray(position_loc)
@@ -565,57 +580,58 @@ class ParticleRenderer(AbstractRenderer):
         """
         Set general uniforms used by the particle shader.
         """
+        shader_program = self.shader_engine.shader_program
         self.shader_engine.use_shader_program()
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "particleSize"), self.particle_size)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "particleSize"), self.particle_size)
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleFadeToColor"),
+            self.shader_engine.get_uniform_location(shader_program, "particleFadeToColor"),
             int(self.particle_fade_to_color),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleFadeColor"),
+            self.shader_engine.get_uniform_location(shader_program, "particleFadeColor"),
             1,
             glm.value_ptr(self.particle_fade_color),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "smoothEdges"), int(self.particle_smooth_edges)
+            self.shader_engine.get_uniform_location(shader_program, "smoothEdges"), int(self.particle_smooth_edges)
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "minWeight"), self.particle_min_weight)
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "maxWeight"), self.particle_max_weight)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "minWeight"), self.particle_min_weight)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "maxWeight"), self.particle_max_weight)
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleMaxVelocity"), self.particle_max_velocity
+            self.shader_engine.get_uniform_location(shader_program, "particleMaxVelocity"), self.particle_max_velocity
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleBounceFactor"), self.particle_bounce_factor
+            self.shader_engine.get_uniform_location(shader_program, "particleBounceFactor"), self.particle_bounce_factor
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleGroundPlaneHeight"),
+            self.shader_engine.get_uniform_location(shader_program, "particleGroundPlaneHeight"),
             self.particle_ground_plane_height,
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleColor"),
+            self.shader_engine.get_uniform_location(shader_program, "particleColor"),
             1,
             glm.value_ptr(self.particle_color),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleGravity"),
+            self.shader_engine.get_uniform_location(shader_program, "particleGravity"),
             1,
             glm.value_ptr(self.particle_gravity),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "fluidSimulation"), int(self.fluid_simulation)
+            self.shader_engine.get_uniform_location(shader_program, "fluidSimulation"), int(self.fluid_simulation)
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "fluidPressure"), self.fluid_pressure)
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "fluidViscosity"), self.fluid_viscosity)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "fluidPressure"), self.fluid_pressure)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "fluidViscosity"), self.fluid_viscosity)
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "fluidForceMultiplier"), self.fluid_force_multiplier
+            self.shader_engine.get_uniform_location(shader_program, "fluidForceMultiplier"), self.fluid_force_multiplier
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "particleGroundPlaneNormal"),
+            self.shader_engine.get_uniform_location(shader_program, "particleGroundPlaneNormal"),
             1,
             glm.value_ptr(self.particle_ground_plane_normal),
         )
         glUniform2f(
-            glGetUniformLocation(self.shader_engine.shader_program, "groundPlaneAngle"),
+            self.shader_engine.get_uniform_location(shader_program, "groundPlaneAngle"),
             self.particle_ground_plane_angle.x,
             self.particle_ground_plane_angle.y,
         )
@@ -624,121 +640,116 @@ class ParticleRenderer(AbstractRenderer):
         """
         Set uniforms required by the compute shader.
         """
+        compute_program = self.shader_engine.compute_shader_program
         self.shader_engine.use_compute_shader_program()
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "shouldGenerate"), int(self.should_generate)
+            self.shader_engine.get_uniform_location(compute_program, "shouldGenerate"), int(self.should_generate)
         )
         current_time_sec = time.time() - self.start_time
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "currentTime"), np.float32(current_time_sec)
-        )
-        glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "deltaTime"), np.float32(self.delta_time)
+            self.shader_engine.get_uniform_location(compute_program, "currentTime"), np.float32(current_time_sec)
         )
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "deltaTime"), np.float32(self.delta_time))
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleMaxLifetime"),
+            self.shader_engine.get_uniform_location(compute_program, "particleMaxLifetime"),
             np.float32(self.particle_max_lifetime),
         )
-        glUniform1i(glGetUniformLocation(self.shader_engine.compute_shader_program, "maxParticles"), self.max_particles)
+        glUniform1i(self.shader_engine.get_uniform_location(compute_program, "maxParticles"), self.max_particles)
         glUniform1ui(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleBatchSize"),
+            self.shader_engine.get_uniform_location(compute_program, "particleBatchSize"),
             np.uint32(self.particle_batch_size),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleGenerator"),
+            self.shader_engine.get_uniform_location(compute_program, "particleGenerator"),
             int(self.particle_generator),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleSpawnTimeJitter"),
+            self.shader_engine.get_uniform_location(compute_program, "particleSpawnTimeJitter"),
             int(self.particle_spawn_time_jitter),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleMaxSpawnTimeJitter"),
+            self.shader_engine.get_uniform_location(compute_program, "particleMaxSpawnTimeJitter"),
             np.float32(self.particle_max_spawn_time_jitter),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleMinWeight"),
+            self.shader_engine.get_uniform_location(compute_program, "particleMinWeight"),
             np.float32(self.particle_min_weight),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleMaxWeight"),
+            self.shader_engine.get_uniform_location(compute_program, "particleMaxWeight"),
             np.float32(self.particle_max_weight),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleGravity"),
+            self.shader_engine.get_uniform_location(compute_program, "particleGravity"),
             1,
             glm.value_ptr(self.particle_gravity),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleMaxVelocity"),
+            self.shader_engine.get_uniform_location(compute_program, "particleMaxVelocity"),
             np.float32(self.particle_max_velocity),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleBounceFactor"),
+            self.shader_engine.get_uniform_location(compute_program, "particleBounceFactor"),
             np.float32(self.particle_bounce_factor),
         )
         glUniform3fv(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleGroundPlaneNormal"),
+            self.shader_engine.get_uniform_location(compute_program, "particleGroundPlaneNormal"),
             1,
             glm.value_ptr(self.particle_ground_plane_normal),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "particleGroundPlaneHeight"),
+            self.shader_engine.get_uniform_location(compute_program, "particleGroundPlaneHeight"),
             np.float32(self.particle_ground_plane_height),
         )
         glUniform2f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "groundPlaneAngle"),
+            self.shader_engine.get_uniform_location(compute_program, "groundPlaneAngle"),
             self.particle_ground_plane_angle.x,
             self.particle_ground_plane_angle.y,
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "fluidPressure"),
+            self.shader_engine.get_uniform_location(compute_program, "fluidPressure"),
             np.float32(self.fluid_pressure),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "fluidViscosity"),
+            self.shader_engine.get_uniform_location(compute_program, "fluidViscosity"),
             np.float32(self.fluid_viscosity),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "fluidForceMultiplier"),
+            self.shader_engine.get_uniform_location(compute_program, "fluidForceMultiplier"),
             self.fluid_force_multiplier,
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "fluidSimulation"),
+            self.shader_engine.get_uniform_location(compute_program, "fluidSimulation"),
             int(self.fluid_simulation),
         )
-        glUniform1f(glGetUniformLocation(self.shader_engine.compute_shader_program, "minX"), np.float32(self.min_width))
-        glUniform1f(glGetUniformLocation(self.shader_engine.compute_shader_program, "maxX"), np.float32(self.max_width))
-        glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "minY"), np.float32(self.min_height)
-        )
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "minX"), np.float32(self.min_width))
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "maxX"), np.float32(self.max_width))
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "minY"), np.float32(self.min_height))
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "maxY"), np.float32(self.max_height))
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "minZ"), np.float32(self.min_depth))
+        glUniform1f(self.shader_engine.get_uniform_location(compute_program, "maxZ"), np.float32(self.max_depth))
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "maxY"), np.float32(self.max_height)
-        )
-        glUniform1f(glGetUniformLocation(self.shader_engine.compute_shader_program, "minZ"), np.float32(self.min_depth))
-        glUniform1f(glGetUniformLocation(self.shader_engine.compute_shader_program, "maxZ"), np.float32(self.max_depth))
-        glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "minInitialVelocityX"),
+            self.shader_engine.get_uniform_location(compute_program, "minInitialVelocityX"),
             np.float32(self.min_initial_velocity_x),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "maxInitialVelocityX"),
+            self.shader_engine.get_uniform_location(compute_program, "maxInitialVelocityX"),
             np.float32(self.max_initial_velocity_x),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "minInitialVelocityY"),
+            self.shader_engine.get_uniform_location(compute_program, "minInitialVelocityY"),
             np.float32(self.min_initial_velocity_y),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "maxInitialVelocityY"),
+            self.shader_engine.get_uniform_location(compute_program, "maxInitialVelocityY"),
             np.float32(self.max_initial_velocity_y),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "minInitialVelocityZ"),
+            self.shader_engine.get_uniform_location(compute_program, "minInitialVelocityZ"),
             np.float32(self.min_initial_velocity_z),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.compute_shader_program, "maxInitialVelocityZ"),
+            self.shader_engine.get_uniform_location(compute_program, "maxInitialVelocityZ"),
             np.float32(self.max_initial_velocity_z),
         )
 
@@ -751,13 +762,14 @@ class ParticleRenderer(AbstractRenderer):
         This involves updating simulation time, handling particle generation,
         and dispatching the appropriate update routine.
         """
+        shader_program = self.shader_engine.shader_program
         self.current_time = time.time()
         elapsed_time = self.current_time - self.start_time
         self.delta_time = min(self.current_time - self.last_time, 0.016)
         self.last_time = self.current_time
 
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "currentTime"), np.float32(elapsed_time))
-        glUniform1f(glGetUniformLocation(self.shader_engine.shader_program, "deltaTime"), self.delta_time)
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "currentTime"), np.float32(elapsed_time))
+        glUniform1f(self.shader_engine.get_uniform_location(shader_program, "deltaTime"), self.delta_time)
 
         if self.generator_delay > 0.0:
             time_since_last = self.current_time - self.last_generation_time
@@ -885,17 +897,34 @@ class ParticleRenderer(AbstractRenderer):
             if self.debug_mode:
                 print(f"Particle {i} -> Pos {pos}, Vel {vel}, Weight {weight}, ID {pid}, LifetimePct {life_pct}")
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        up_data = np.hstack(
-            (
-                self.cpu_particles[: self.active_particles, 0:4],
-                self.cpu_particles[: self.active_particles, 12].reshape(-1, 1),
-                self.cpu_particles[: self.active_particles, 10].reshape(-1, 1),
-            )
-        ).astype(np.float32)
-        glBufferSubData(GL_ARRAY_BUFFER, 0, up_data.nbytes, up_data)
+        self._write_cpu_particles_to_buffer(self.active_particles)
         glBindBuffer(GL_ARRAY_BUFFER, 0)
         self.particles_to_render = self.active_particles
 
+    def _write_cpu_particles_to_buffer(self, count):
+        """
+        Write [position, lifetimePercentage, particleID] for the first `count` CPU particles
+        into the bound VBO. The buffer is mapped with invalidation (so the driver can orphan
+        it instead of stalling on the previous frame's draw) and the columns are written
+        straight into it, avoiding a temporary array that glBufferSubData would copy again.
+        """
+        if count <= 0:
+            return
+        upload_bytes = count * self.particle_byte_size_cpu
+        ptr = glMapBufferRange(GL_ARRAY_BUFFER, 0, upload_bytes, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT)
+        if ptr:
+            mapped = np.ctypeslib.as_array((ctypes.c_float * (count * self.stride_length_cpu)).from_address(ptr))
+            upload = mapped.reshape(count, self.stride_length_cpu)
+        else:
+            upload = np.empty((count, self.stride_length_cpu), dtype=np.float32)
+        upload[:, 0:4] = self.cpu_particles[:count, 0:4]
+        upload[:, 4] = self.cpu_particles[:count, 12]
+        upload[:, 5] = self.cpu_particles[:count, 10]
+        if ptr:
+            glUnmapBuffer(GL_ARRAY_BUFFER)
+        else:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, upload.nbytes, upload)
+
     def _update_particles_compute_shader(self):
         self.shader_engine.use_compute_shader_program()
         self.set_compute_uniforms()
@@ -913,7 +942,7 @@ class ParticleRenderer(AbstractRenderer):
         self.shader_engine.use_shader_program()
         source_vbo = self.vbos[self.current_vbo_index]
         dest_vbo = self.vbos[1 - self.current_vbo_index]
-        glBindVertexArray(self.vao)
+        gl_state.bind_vao(self.vao)
         glBindBuffer(GL_ARRAY_BUFFER, source_vbo)
         self._setup_vertex_attributes()
         glEnable(GL_RASTERIZER_DISCARD)
@@ -926,7 +955,7 @@ class ParticleRenderer(AbstractRenderer):
             glMemoryBarrier(GL_TRANSFORM_FEEDBACK_BARRIER_BIT)
         else:
             glFinish()
-        glBindVertexArray(0)
+        gl_state.bind_vao(0)
         self.current_vbo_index = 1 - self.current_vbo_index
         self.particles_to_render = self.max_particles
 
@@ -979,7 +1008,7 @@ class ParticleRenderer(AbstractRenderer):
             current_vbo = self.vbos[self.current_vbo_index]
             self._setup_vertex_attributes()
             glBindBuffer(GL_ARRAY_BUFFER, current_vbo)
-        glBindVertexArray(self.vao)
+        gl_state.bind_vao(self.vao)
         if self.debug_mode:
             if self.particle_render_mode == "transform_feedback":
                 self.print_vao_contents_transform_feedback()
@@ -1003,4 +1032,3 @@ class ParticleRenderer(AbstractRenderer):
         }
         primitive = primitive_types.get(self.particle_type, GL_POINTS)
         glDrawArrays(primitive, 0, self.particles_to_render)
-        glBindVertexArray(0)
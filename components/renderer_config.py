@@ -372,6 +372,8 @@ class RendererConfig:
         refraction_strength=None,
         lens_rotations=None,
         pbr_extension_overrides=None,
+        fast_obj_loader=None,
+        mesh_cache=None,
         debug_mode=None,
         **kwargs,
     ):
@@ -454,6 +456,8 @@ class RendererConfig:
             "refraction_strength": refraction_strength,
             "lens_rotations": lens_rotations,
             "pbr_extension_overrides": pbr_extension_overrides,
+            "fast_obj_loader": fast_obj_loader,
+            "mesh_cache": mesh_cache,
             "debug_mode": debug_mode,
         }
 
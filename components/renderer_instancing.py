@@ -6,12 +6,17 @@ import time
 from OpenGL.GL import *
 
 from components.audio_player import AudioPlayer
+from components.gl_state import GLState
 from components.model_renderer import ModelRenderer
 from components.particle_renderer import ParticleRenderer
 from components.renderer_window import RendererWindow
 from components.scene_constructor import SceneConstructor
 from components.skybox_renderer import SkyboxRenderer
 from components.surface_renderer import SurfaceRenderer
+from components.texture_manager import TextureManager
+
+gl_state = GLState()
+texture_manager = TextureManager()
 
 
 class RenderingInstance:
@@ -70,6 +75,8 @@ class RenderingInstance:
             vsync_enabled=self.config.vsync_enabled,
             fullscreen=self.config.fullscreen,
         )
+        # A new context starts with default bindings, so drop any cached GL state
+        gl_state.reset()
 
         # 2) Store the maximum run duration
         self.duration = self.config.duration
@@ -175,8 +182,12 @@ class RenderingInstance:
         for framebuffer, texture in self.framebuffers.values():
             glDeleteFramebuffers(1, [framebuffer])
             glDeleteTextures(1, [texture])
+            gl_state.forget_textures([texture])
         self.framebuffers.clear()
 
+        # Textures loaded from disk are shared between renderers, so they are freed here once
+        texture_manager.release_loaded_textures()
+
         # 4) Close the window/context
         if self.render_window:
             self.render_window.shutdown()
@@ -337,7 +348,7 @@ class RenderingInstance:
         Create and configure a 2D texture.
         """
         texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, None)
         self.set_texture_parameters()
         return texture
@@ -2,6 +2,10 @@ import os
 
 from OpenGL.GL import *
 
+from components.gl_state import GLState
+
+gl_state = GLState()
+
 
 class ShaderEngine:
     """
@@ -36,6 +40,10 @@ class ShaderEngine:
         """
         self.shader_base_dir = shader_base_dir
         self.common_dir_name = common_dir_name
+        # (program, uniform name) -> location, filled at link time and on first lookup
+        self.uniform_locations = {}
+        # (program, attribute name) -> location, filled on first lookup
+        self.attribute_locations = {}
 
         # Main rendering shaders
         self.shader_program = None
@@ -60,17 +68,82 @@ class ShaderEngine:
     def use_shader_program(self):
         """Activate the main vertex/fragment shader program."""
         if self.shader_program:
-            glUseProgram(self.shader_program)
+            gl_state.use_program(self.shader_program)
 
     def use_compute_shader_program(self):
         """Activate the compute shader program."""
         if self.compute_shader_program:
-            glUseProgram(self.compute_shader_program)
+            gl_state.use_program(self.compute_shader_program)
 
     def use_shadow_shader_program(self):
         """Activate the shadow vertex/fragment shader program."""
         if self.shadow_shader_program:
-            glUseProgram(self.shadow_shader_program)
+            gl_state.use_program(self.shadow_shader_program)
+
+    def get_uniform_location(self, program, name):
+        """
+        Return the location of a uniform in one of this engine's programs. Locations are
+        fixed once a program is linked, so each is queried from the driver only once.
+
+        Args:
+            program (int): OpenGL program handle.
+            name (str): Uniform name.
+
+        Returns:
+            int: The uniform location, or -1 if the program has no active uniform of that name.
+        """
+        key = (program, name)
+        location = self.uniform_locations.get(key)
+        if location is None:
+            location = glGetUniformLocation(program, name)
+            self.uniform_locations[key] = location
+        return location
+
+    def get_attribute_location(self, program, name):
+        """
+        Return the location of a vertex attribute in one of this engine's programs,
+        querying the driver only the first time.
+
+        Args:
+            program (int): OpenGL program handle.
+            name (str): Attribute name.
+
+        Returns:
+            int: The attribute location, or -1 if the program has no active attribute of that name.
+        """
+        key = (program, name)
+        location = self.attribute_locations.get(key)
+        if location is None:
+            location = glGetAttribLocation(program, name)
+            self.attribute_locations[key] = location
+        return location
+
+    def cache_uniform_locations(self, program):
+        """
+        Look up the location of every active uniform of a freshly linked program up front,
+        so the first frames don't pay for driver lookups. Entries cached for an earlier
+        link of the same program are replaced, and its attribute locations are looked up
+        again on next use.
+
+        Args:
+            program (int): OpenGL program handle.
+        """
+        self.uniform_locations = {key: loc for key, loc in self.uniform_locations.items() if key[0] != program}
+        self.attribute_locations = {key: loc for key, loc in self.attribute_locations.items() if key[0] != program}
+        for index in range(glGetProgramiv(program, GL_ACTIVE_UNIFORMS)):
+            name = glGetActiveUniform(program, index)[0].decode()
+            location = glGetUniformLocation(program, name)
+            self.uniform_locations[(program, name)] = location
+            if name.endswith("[0]"):
+                # Arrays are reported by their first element but also looked up by plain name
+                self.uniform_locations[(program, name[:-3])] = location
+
+    def forget_locations(self):
+        """
+        Drop all cached uniform and attribute locations, e.g. once the programs are deleted.
+        """
+        self.uniform_locations = {}
+        self.attribute_locations = {}
 
     def delete_shader_programs(self):
         """
@@ -78,10 +151,14 @@ class ShaderEngine:
         """
         if self.shader_program:
             glDeleteProgram(self.shader_program)
+            gl_state.forget_program(self.shader_program)
         if self.compute_shader_program:
             glDeleteProgram(self.compute_shader_program)
+            gl_state.forget_program(self.compute_shader_program)
         if self.shadow_shader_program:
             glDeleteProgram(self.shadow_shader_program)
+            gl_state.forget_program(self.shadow_shader_program)
+        self.forget_locations()
 
     # --------------------------------------------------------------------------
     # Creation of Shader Programs
@@ -124,6 +201,7 @@ class ShaderEngine:
             raise RuntimeError(f"Error linking compute shader program: {log.decode()}")
 
         glDeleteShader(compute_shader)
+        self.cache_uniform_locations(shader_program)
         return shader_program
 
     # --------------------------------------------------------------------------
@@ -232,4 +310,5 @@ class ShaderEngine:
             glDeleteProgram(shader_program)
             raise RuntimeError(f"Error linking shader program: {log.decode()}")
 
+        self.cache_uniform_locations(shader_program)
         return shader_program
@@ -1,8 +1,11 @@
 import glm
 from OpenGL.GL import *
 
+from components.gl_state import GLState
 from utils.decorators import singleton
 
+gl_state = GLState()
+
 
 @singleton
 class ShadowMapManager:
@@ -34,7 +37,7 @@ class ShadowMapManager:
         """
         Create the depth texture and attach it to the FBO.
         """
-        glBindTexture(GL_TEXTURE_2D, self.depth_map)
+        gl_state.bind_texture(GL_TEXTURE_2D, self.depth_map)
         glTexImage2D(
             GL_TEXTURE_2D,
             0,
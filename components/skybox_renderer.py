@@ -3,6 +3,9 @@ import numpy as np
 from OpenGL.GL import *
 
 from components.abstract_renderer import AbstractRenderer, with_gl_render_state
+from components.gl_state import GLState
+
+gl_state = GLState()
 
 
 class SkyboxRenderer(AbstractRenderer):
@@ -36,9 +39,9 @@ class SkyboxRenderer(AbstractRenderer):
         self.skybox_vao = glGenVertexArrays(1)
         self.skybox_vbo = glGenBuffers(1)
 
-        glBindVertexArray(self.skybox_vao)
+        gl_state.bind_vao(self.skybox_vao)
         self._setup_vertex_buffer(vertices_array)
-        glBindVertexArray(0)
+        gl_state.bind_vao(0)
 
     def _generate_skybox_vertices(self):
         """
@@ -161,7 +164,7 @@ class SkyboxRenderer(AbstractRenderer):
         Upload skybox vertices to the GPU and configure the vertex attribute pointers.
         """
         glBindBuffer(GL_ARRAY_BUFFER, self.skybox_vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices_array.nbytes, vertices_array, GL_STATIC_DRAW)
+        gl_state.upload_static_buffer(GL_ARRAY_BUFFER, vertices_array)
 
         glEnableVertexAttribArray(0)
         glVertexAttribPointer(
@@ -186,9 +189,8 @@ class SkyboxRenderer(AbstractRenderer):
         self._set_shader_matrices()
 
         # Draw
-        glBindVertexArray(self.skybox_vao)
+        gl_state.bind_vao(self.skybox_vao)
         glDrawArrays(GL_TRIANGLES, 0, 36)
-        glBindVertexArray(0)
 
         # Revert depth function
         glDepthFunc(GL_LESS)
@@ -198,16 +200,17 @@ class SkyboxRenderer(AbstractRenderer):
         For the skybox, we remove the translation from the view matrix,
         so the skybox appears infinitely far away.
         """
+        shader_program = self.shader_engine.shader_program
         # Drop the translation component from the view matrix
         view_matrix = glm.mat4(glm.mat3(self.view))
         projection_matrix = self.projection
 
         # Update the shader uniforms
         glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "view"), 1, GL_FALSE, glm.value_ptr(view_matrix)
+            self.shader_engine.get_uniform_location(shader_program, "view"), 1, GL_FALSE, glm.value_ptr(view_matrix)
         )
         glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "projection"),
+            self.shader_engine.get_uniform_location(shader_program, "projection"),
             1,
             GL_FALSE,
             glm.value_ptr(projection_matrix),
@@ -215,18 +218,18 @@ class SkyboxRenderer(AbstractRenderer):
 
         # Additional custom uniforms for up-scaling or post-effects
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "uOffset"),
+            self.shader_engine.get_uniform_location(shader_program, "uOffset"),
             self.dynamic_attrs.get("upscale_offset", 0.005),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "uLobes"),
+            self.shader_engine.get_uniform_location(shader_program, "uLobes"),
             self.dynamic_attrs.get("upscale_lobes", 3.0),
         )
         glUniform1i(
-            glGetUniformLocation(self.shader_engine.shader_program, "uSampleRadius"),
+            self.shader_engine.get_uniform_location(shader_program, "uSampleRadius"),
             self.dynamic_attrs.get("upscale_sample_radius", 2),
         )
         glUniform1f(
-            glGetUniformLocation(self.shader_engine.shader_program, "uStepSize"),
+            self.shader_engine.get_uniform_location(shader_program, "uStepSize"),
             self.dynamic_attrs.get("upscale_step_size", 0.5),
         )
@@ -3,6 +3,9 @@ import numpy as np
 from OpenGL.GL import *
 
 from components.abstract_renderer import AbstractRenderer, with_gl_render_state
+from components.gl_state import GLState
+
+gl_state = GLState()
 
 
 class Mesh:
@@ -36,6 +39,7 @@ class SurfaceRenderer(AbstractRenderer):
         self.vaos = []
         self.vbos = []
         self.ebos = []
+        self.draw_counts = []
         self.object = None  # Will hold a SceneObject with one or more Meshes
 
     def supports_shadow_mapping(self):
@@ -91,19 +95,20 @@ class SurfaceRenderer(AbstractRenderer):
         # Create VAOs/VBOs for each mesh in the object
         for mesh_obj in self.object.mesh_list:
             vao = glGenVertexArrays(1)
-            glBindVertexArray(vao)
+            gl_state.bind_vao(vao)
             self.vaos.append(vao)
 
             vbo = glGenBuffers(1)
             glBindBuffer(GL_ARRAY_BUFFER, vbo)
-            glBufferData(GL_ARRAY_BUFFER, mesh_obj.vertices.nbytes, mesh_obj.vertices, GL_STATIC_DRAW)
+            gl_state.upload_static_buffer(GL_ARRAY_BUFFER, mesh_obj.vertices)
             self.vbos.append(vbo)
 
             # No EBO usage here since we do a simple glDrawArrays, but you could handle indices.
             self.ebos.append(None)
+            self.draw_counts.append(len(mesh_obj.faces) * 3)
 
             self._setup_vertex_attributes()
-            glBindVertexArray(0)
+            gl_state.bind_vao(0)
 
     def _generate_surface_geometry(self):
         """
@@ -160,15 +165,16 @@ class SurfaceRenderer(AbstractRenderer):
         Configure the vertex attribute pointers for position, normal,
         texCoords, tangent, and bitangent.
         """
+        shader_program = self.shader_engine.shader_program
         float_size = 4
         # 14 floats per vertex -> position(3), normal(3), texCoords(2), tangent(3), bitangent(3)
         vertex_stride = 14 * float_size
 
-        position_loc = glGetAttribLocation(self.shader_engine.shader_program, "position")
-        normal_loc = glGetAttribLocation(self.shader_engine.shader_program, "normal")
-        tex_coords_loc = glGetAttribLocation(self.shader_engine.shader_program, "texCoords")
-        tangent_loc = glGetAttribLocation(self.shader_engine.shader_program, "tangent")
-        bitangent_loc = glGetAttribLocation(self.shader_engine.shader_program, "bitangent")
+        position_loc = self.shader_engine.get_attribute_location(shader_program, "position")
+        normal_loc = self.shader_engine.get_attribute_location(shader_program, "normal")
+        tex_coords_loc = self.shader_engine.get_attribute_location(shader_program, "texCoords")
+        tangent_loc = self.shader_engine.get_attribute_location(shader_program, "tangent")
+        bitangent_loc = self.shader_engine.get_attribute_location(shader_program, "bitangent")
 
         # position -> offset 0
         if position_loc >= 0:
@@ -195,16 +201,31 @@ class SurfaceRenderer(AbstractRenderer):
             glEnableVertexAttribArray(bitangent_loc)
             glVertexAttribPointer(bitangent_loc, 3, GL_FLOAT, GL_FALSE, vertex_stride, ctypes.c_void_p(11 * float_size))
 
+    def draw_meshes(self):
+        """
+        Draw every mesh with the vertex counts computed in create_buffers.
+        """
+        for vao, count in zip(self.vaos, self.draw_counts):
+            gl_state.bind_vao(vao)
+            glDrawArrays(GL_TRIANGLES, 0, count)
+
+    def draw_from_light(self):
+        """
+        The shadow pass draws the same geometry as the main pass.
+        """
+        self.draw_meshes()
+
     @with_gl_render_state
     def render(self):
         """
         Render the surface using the currently bound shader and the model matrix.
         """
+        shader_program = self.shader_engine.shader_program
         self.shader_engine.use_shader_program()
 
         # Upload model transform
         glUniformMatrix4fv(
-            glGetUniformLocation(self.shader_engine.shader_program, "model"),
+            self.shader_engine.get_uniform_location(shader_program, "model"),
             1,
             GL_FALSE,
             glm.value_ptr(self.model_matrix),
@@ -213,11 +234,7 @@ class SurfaceRenderer(AbstractRenderer):
         self.set_constant_uniforms()
 
         # Indicate to the shader that we are rendering a surface
-        glUniform1i(glGetUniformLocation(self.shader_engine.shader_program, "surfaceMapping"), 1)
+        glUniform1i(self.shader_engine.get_uniform_location(shader_program, "surfaceMapping"), 1)
 
         # Draw the plane as two triangles
-        for mesh_obj in self.object.mesh_list:
-            vao_index = self.object.mesh_list.index(mesh_obj)
-            glBindVertexArray(self.vaos[vao_index])
-            glDrawArrays(GL_TRIANGLES, 0, len(mesh_obj.faces) * 3)
-            glBindVertexArray(0)
+        self.draw_meshes()
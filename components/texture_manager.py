@@ -1,8 +1,13 @@
+import os
+
 import numpy as np
 from OpenGL.GL import *
 
+from components.gl_state import GLState
 from utils.decorators import singleton
 
+gl_state = GLState()
+
 
 @singleton
 class TextureManager:
@@ -12,6 +17,7 @@ class TextureManager:
     Provides:
       - A mapping from (object identifier, texture type) -> unique texture unit
       - A dummy texture used when no valid texture is available.
+      - A cache of textures loaded from disk, shared by every renderer using the same file.
     """
 
     def __init__(self):
@@ -27,6 +33,7 @@ class TextureManager:
         self.current_texture_unit = 0
         self.texture_unit_map = {}
         self.dummy_texture = None
+        self.loaded_textures = {}
 
     def get_texture_unit(self, identifier, texture_type):
         """
@@ -55,6 +62,38 @@ class TextureManager:
         self.current_texture_unit += 1
         return texture_unit
 
+    def get_or_load(self, path, loader, variant=()):
+        """
+        Return the texture loaded from path, creating and uploading it on first use only,
+        so renderers sharing a file share one texture object (and its GPU memory).
+
+        Args:
+            path (str): File or folder the texture is loaded from.
+            loader (callable): Called as loader(path, texture) to upload into a new texture handle.
+            variant (tuple): Any loader parameters baked into the texture (e.g. filtering),
+                so the same file loaded with different settings gets its own texture.
+
+        Returns:
+            int: OpenGL texture handle.
+        """
+        # Resolve the path so different spellings of the same file share one texture
+        key = (os.path.realpath(path), variant)
+        if key not in self.loaded_textures:
+            texture = glGenTextures(1)
+            loader(path, texture)
+            self.loaded_textures[key] = texture
+        return self.loaded_textures[key]
+
+    def release_loaded_textures(self):
+        """
+        Delete every cached texture. Must run while the context that created them is current.
+        """
+        textures = list(self.loaded_textures.values())
+        if textures:
+            glDeleteTextures(len(textures), textures)
+            gl_state.forget_textures(textures)
+        self.loaded_textures = {}
+
     def get_dummy_texture(self):
         """
         Retrieve the dummy texture (a small white depth component texture).
@@ -74,13 +113,15 @@ class TextureManager:
         Returns:
             int: The new texture handle.
         """
+        # Restore whatever the active unit had bound, since this can run mid-frame
+        previous_texture = gl_state.bound_textures.get((gl_state.active_unit, GL_TEXTURE_2D), 0)
         dummy_texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, dummy_texture)
+        gl_state.bind_texture(GL_TEXTURE_2D, dummy_texture)
 
         data = np.array([1.0], dtype=np.float32)  # single-pixel float depth=1.0
         glTexImage2D(GL_TEXTURE_2D, 0, GL_DEPTH_COMPONENT, 1, 1, 0, GL_DEPTH_COMPONENT, GL_FLOAT, data)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
-        glBindTexture(GL_TEXTURE_2D, 0)
+        gl_state.bind_texture(GL_TEXTURE_2D, previous_texture)
 
         return dummy_texture
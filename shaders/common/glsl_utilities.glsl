@@ -75,13 +75,16 @@ uniform float shadowStrength;
 // ---------------------------------------------------
 // Extended PBR Material Structure
 // ---------------------------------------------------
-struct Material {
-//    vec3 ambient;// from Ka (currently unused, ambientColor is used instead)
-//    vec3 diffuse;// from Kd (currently unused, baseColor is used instead)
+// Uploaded once per material as a std140 uniform buffer (see model_renderer.py).
+// Fields are ordered so each vec3 shares a 16-byte slot with a scalar.
+// Unused MTL fields: Ka/Kd (ambientColor/baseColor are used instead),
+// d (overridden by legacyOpacity), aniso/anisor.
+layout(std140) uniform MaterialBlock {
     vec3 specular;// from Ks
-    vec3 emissive;// from Ke
     float fresnelExponent;// from Pfe (non-standard parameter)
+    vec3 emissive;// from Ke
     int illuminationModel;// from illum
+    vec3 transmission;// Tf
 
 // "Core" PBR fields
     float roughness;// 'Pr' in Blender MTL
@@ -89,15 +92,10 @@ struct Material {
 
 // Additional MTL parameters
     float ior;// Ni (index of refraction)
-//    float transparency;// d (alpha/dissolve) (currently unused, overriden by legacyOpacity)
     float clearcoat;// Pc
     float clearcoatRoughness;// Pcr
     float sheen;// Ps
-//    float anisotropy;// aniso (currently unused)
-//    float anisotropyRot;// anisor (currently unused)
-    vec3 transmission;// Tf
-};
-uniform Material material;
+} material;
 
 // ---------------------------------------------------
 // Helper Functions to Make Code DRY
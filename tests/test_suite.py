@@ -361,6 +361,361 @@ class TestPurePythonExtended(unittest.TestCase):
         mock_renderer.scale.assert_called_with((2, 2, 2))
         mock_renderer.enable_auto_rotation.assert_called_with(True, axis=(0, 1, 0), speed=1000)
 
+    def test_pack_vertex_data(self):
+        """
+        Test that packed vertices keep positions exact and normals/UVs within quantization error.
+        """
+        import numpy as np
+
+        from components.model_renderer import PACKED_ATTRIBUTE_DTYPE, pack_vertex_data
+
+        verts = np.zeros((3, 14), dtype=np.float32)
+        verts[:, 0:3] = [[1.5, -2.25, 80.9], [0.0, 1.0, 0.0], [-3.0, 0.5, 2.0]]
+        verts[:, 3:6] = [[0.0, 2.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, -1.0]]
+        verts[:, 6:8] = [[0.0, 0.0], [1.0, 0.5], [0.25, 1.0]]
+        verts[:, 8:11] = [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [-1.0, 0.0, 0.0]]
+        verts[:, 11:14] = [[0.0, 0.0, 1.0], [0.0, -1.0, 0.0], [0.0, 1.0, 0.0]]
+
+        positions, packed, uv_normalized = pack_vertex_data(verts)
+        self.assertEqual(positions.nbytes + packed.nbytes, 28 * 3)
+        self.assertEqual(PACKED_ATTRIBUTE_DTYPE.itemsize, 16)
+        self.assertTrue(uv_normalized)
+        np.testing.assert_array_equal(positions, verts[:, 0:3])
+        np.testing.assert_allclose(packed["tex_coords"] / 65535.0, verts[:, 6:8], atol=1e-4)
+
+        # Decode signed 10-bit fields; the first normal is unit-length after packing.
+        words = packed["normal"].astype(np.int64)
+        fields = np.stack([(words >> shift) & 0x3FF for shift in (0, 10, 20)], axis=1)
+        decoded = np.where(fields >= 512, fields - 1024, fields) / 511.0
+        np.testing.assert_allclose(decoded, [[0, 1, 0], [1, 0, 0], [0, 0, -1]], atol=2e-3)
+
+        # UVs just outside [0, 1] (exporter rounding) are clamped and stay unorm16
+        verts[0, 6] = -0.000719
+        verts[1, 6] = 1.0004
+        _, packed, uv_normalized = pack_vertex_data(verts)
+        self.assertTrue(uv_normalized)
+        self.assertEqual(packed["tex_coords"][0, 0], 0)
+        self.assertEqual(packed["tex_coords"][1, 0], 65535)
+
+        # Tiled UVs fall back to full float32 precision
+        verts[0, 6] = -0.5
+        verts[1, 6] = 7.123456
+        _, packed, uv_normalized = pack_vertex_data(verts)
+        self.assertFalse(uv_normalized)
+        self.assertEqual(packed.dtype.itemsize, 20)
+        np.testing.assert_array_equal(packed["tex_coords"], verts[:, 6:8])
+
+    def test_light_arrays_repack_and_clamp(self):
+        """
+        Test that replacing the lights flags the packed arrays for a rebuild and that
+        the packed count never exceeds the size of the shader light arrays.
+        """
+        from components.abstract_renderer import MAX_LIGHTS, AbstractRenderer
+
+        LightHolder = type(
+            "LightHolder",
+            (),
+            {"lights": AbstractRenderer.lights, "pack_light_arrays": AbstractRenderer.pack_light_arrays},
+        )
+
+        def make_light(index):
+            return {
+                "position": (index, 0.0, 0.0),
+                "color": (1.0, 1.0, 1.0),
+                "strength": float(index),
+                "orth_left": -10.0,
+                "orth_right": 10.0,
+                "orth_bottom": -10.0,
+                "orth_top": 10.0,
+            }
+
+        holder = LightHolder()
+        holder.lights = [make_light(0)]
+        self.assertTrue(holder.lights_dirty)
+        holder.pack_light_arrays()
+        self.assertFalse(holder.lights_dirty)
+        self.assertEqual(holder.light_count, 1)
+
+        holder.lights = [make_light(index) for index in range(MAX_LIGHTS + 3)]
+        self.assertTrue(holder.lights_dirty)
+        with contextlib.redirect_stdout(io.StringIO()):
+            holder.pack_light_arrays()
+        self.assertEqual(holder.light_count, MAX_LIGHTS)
+        self.assertEqual(holder.light_positions.shape, (MAX_LIGHTS, 3))
+        self.assertEqual(holder.light_strengths.tolist(), [float(index) for index in range(MAX_LIGHTS)])
+
+    def test_index_vertices(self):
+        """
+        Test that shared triangle corners are merged in first-appearance order.
+        """
+        import numpy as np
+
+        from components.model_renderer import index_vertices
+
+        a, b, c, d = np.eye(4, 8, dtype=np.float32)
+        verts = np.array([a, b, c, c, b, d], dtype=np.float32)
+
+        unique_vertices, indices = index_vertices(verts)
+        np.testing.assert_array_equal(unique_vertices, [a, b, c, d])
+        np.testing.assert_array_equal(indices, [0, 1, 2, 2, 1, 3])
+        np.testing.assert_array_equal(unique_vertices[indices], verts)
+
+    def test_gather_t2f_n3f_v3f(self):
+        """
+        Test that T2F_N3F_V3F blocks are concatenated and reordered to [pos, normal, uv].
+        """
+        import numpy as np
+
+        from components.model_renderer import gather_t2f_n3f_v3f
+
+        blocks = [np.arange(16, dtype=np.float32).reshape(2, 8), np.arange(8, dtype=np.float32).reshape(1, 8) + 100]
+        vertices = gather_t2f_n3f_v3f(blocks)
+        np.testing.assert_array_equal(vertices[:, 0:3], [[5, 6, 7], [13, 14, 15], [105, 106, 107]])
+        np.testing.assert_array_equal(vertices[:, 3:6], [[2, 3, 4], [10, 11, 12], [102, 103, 104]])
+        np.testing.assert_array_equal(vertices[:, 6:8], [[0, 1], [8, 9], [100, 101]])
+
+    def test_get_vertex_stride(self):
+        """
+        Test that vertex strides are computed from pywavefront format strings.
+        """
+        from components.abstract_renderer import get_vertex_stride
+
+        self.assertEqual(get_vertex_stride("T2F_N3F_V3F"), 8)
+        self.assertEqual(get_vertex_stride("T2F_C3F_N3F_V3F"), 11)
+        self.assertEqual(get_vertex_stride("V3F"), 3)
+
+    def test_fast_obj_load_matches_pywavefront(self):
+        """
+        Test that the NumPy OBJ loader produces the same meshes, materials and vertices as pywavefront.
+        """
+        import numpy as np
+        import pywavefront
+
+        from components.obj_loader import fast_obj_load
+
+        obj_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models", "pyramid.obj")
+        expected = pywavefront.Wavefront(obj_path, create_materials=True, collect_faces=True)
+        loaded = fast_obj_load(obj_path, collect_faces=True)
+
+        self.assertEqual([mesh.name for mesh in loaded.mesh_list], [mesh.name for mesh in expected.mesh_list])
+        for loaded_mesh, expected_mesh in zip(loaded.mesh_list, expected.mesh_list):
+            self.assertEqual(loaded_mesh.faces, expected_mesh.faces)
+            for loaded_material, expected_material in zip(loaded_mesh.materials, expected_mesh.materials):
+                self.assertEqual(loaded_material.name, expected_material.name)
+                self.assertEqual(loaded_material.vertex_format, expected_material.vertex_format)
+                np.testing.assert_array_equal(loaded_material.vertices, np.float32(expected_material.vertices))
+
+    def test_compute_tangents_and_bitangents(self):
+        """
+        Test that the tangent frame is unit length, orthogonal to the normal and right-handed,
+        including for mirrored UVs and for a triangle whose UVs are degenerate.
+        """
+        import numpy as np
+
+        from components.model_renderer import ModelRenderer
+
+        renderer = object.__new__(ModelRenderer)
+
+        def check_frame(result):
+            normals = result[:, 3:6]
+            tangents = result[:, 8:11]
+            bitangents = result[:, 11:14]
+            np.testing.assert_allclose(np.linalg.norm(tangents, axis=1), 1.0, atol=1e-5)
+            np.testing.assert_allclose(np.linalg.norm(bitangents, axis=1), 1.0, atol=1e-5)
+            np.testing.assert_allclose(np.einsum("ij,ij->i", normals, tangents), 0.0, atol=1e-5)
+            np.testing.assert_allclose(np.einsum("ij,ij->i", normals, bitangents), 0.0, atol=1e-5)
+            np.testing.assert_allclose(np.einsum("ij,ij->i", tangents, bitangents), 0.0, atol=1e-5)
+            handedness = np.einsum("ij,ij->i", np.cross(normals, tangents), bitangents)
+            self.assertTrue(np.all(handedness > 0.0))
+
+        # Indexed unit quad in the XY plane facing +Z, with u along +X and v along +Y
+        corners = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+        quad = np.zeros((4, 8), dtype=np.float32)
+        quad[:, 0:2] = corners
+        quad[:, 5] = 1.0
+        quad[:, 6:8] = corners
+        indices = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+        result = renderer.compute_tangents_and_bitangents(quad, indices)
+        self.assertEqual(result.shape, (4, 14))
+        np.testing.assert_array_equal(result[:, 0:8], quad)
+        check_frame(result)
+        np.testing.assert_allclose(result[:, 8:11], [[1.0, 0.0, 0.0]] * 4, atol=1e-5)
+        np.testing.assert_allclose(result[:, 11:14], [[0.0, 1.0, 0.0]] * 4, atol=1e-5)
+
+        # Mirroring u flips the tangent; the bitangent is kept on the right-handed side
+        mirrored = quad.copy()
+        mirrored[:, 6] = 1.0 - mirrored[:, 6]
+        result = renderer.compute_tangents_and_bitangents(mirrored, indices)
+        check_frame(result)
+        np.testing.assert_allclose(result[:, 8:11], [[-1.0, 0.0, 0.0]] * 4, atol=1e-5)
+        np.testing.assert_allclose(result[:, 11:14], [[0.0, -1.0, 0.0]] * 4, atol=1e-5)
+
+        # A triangle with every UV at the same point falls back to a frame around its normal
+        degenerate = np.zeros((3, 8), dtype=np.float32)
+        degenerate[:, 0:3] = [[0, 0, 0], [0, 1, 0], [0, 0, 1]]
+        degenerate[:, 3] = 1.0
+        degenerate[:, 6:8] = 0.5
+        result = renderer.compute_tangents_and_bitangents(degenerate)
+        self.assertTrue(np.all(np.isfinite(result)))
+        check_frame(result)
+
+    def test_create_static_buffer_direct_state_access(self):
+        """
+        Test that the direct state access path passes glCreateBuffers an output array
+        and fills the returned buffer with glNamedBufferStorage, without binding it.
+        """
+        import numpy as np
+
+        from components.gl_state import GLState
+
+        def create_buffers(count, names):
+            names[:count] = 7
+
+        gl_state = GLState()
+        gl_state.reset()
+        data = np.arange(6, dtype=np.float32)
+        try:
+            with (
+                patch("components.gl_state.glCreateBuffers", side_effect=create_buffers) as create,
+                patch("components.gl_state.glNamedBufferStorage") as storage,
+                patch("components.gl_state.glBindBuffer") as bind,
+            ):
+                buffer = gl_state.create_static_buffer(data)
+        finally:
+            gl_state.reset()
+
+        self.assertEqual(buffer, 7)
+        self.assertIsInstance(buffer, int)
+        self.assertEqual(create.call_args.args[0], 1)
+        storage.assert_called_once_with(7, data.nbytes, data, 0)
+        bind.assert_not_called()
+
+    def test_optimize_vertex_cache(self):
+        """
+        Test that the vertex cache optimizer returns a triangle permutation with fewer cache misses.
+        """
+        import numpy as np
+
+        from components.model_renderer import optimize_vertex_cache
+
+        def cache_misses(indices, cache_size=16):
+            cache = []
+            misses = 0
+            for vertex in indices:
+                if vertex not in cache:
+                    misses += 1
+                    cache = [vertex] + cache[: cache_size - 1]
+            return misses
+
+        # A 20 x 20 quad grid with its triangles shuffled
+        grid = np.arange(21 * 21).reshape(21, 21)
+        corners = np.stack((grid[:-1, :-1], grid[1:, :-1], grid[:-1, 1:], grid[1:, 1:]), axis=-1).reshape(-1, 4)
+        triangles = np.concatenate((corners[:, [0, 1, 2]], corners[:, [2, 1, 3]]))
+        triangles = triangles[np.random.default_rng(0).permutation(len(triangles))]
+
+        order = optimize_vertex_cache(triangles)
+
+        self.assertEqual(sorted(order.tolist()), list(range(len(triangles))))
+        self.assertLess(cache_misses(triangles[order].ravel()), cache_misses(triangles.ravel()) // 2)
+
+    def test_optimize_overdraw(self):
+        """
+        Test that the overdraw optimizer reorders whole clusters and puts outward-facing ones first.
+        """
+        import numpy as np
+
+        from components.model_renderer import optimize_overdraw
+
+        # Two quads facing +z: one on the far side (z = -1, facing into the mesh) and one in front (z = 1)
+        positions = np.array(
+            [[0, 0, -1], [1, 0, -1], [0, 1, -1], [1, 1, -1], [0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 1]],
+            dtype=np.float32,
+        )
+        triangles = np.array([[0, 1, 2], [2, 1, 3], [4, 5, 6], [6, 5, 7]])
+
+        order = optimize_overdraw(triangles, positions)
+
+        self.assertEqual(order.tolist(), [2, 3, 0, 1])
+
+    def test_mesh_cache_round_trip(self):
+        """
+        Test that a saved mesh cache loads back unchanged and is ignored when its signature differs.
+        """
+        import tempfile
+
+        import numpy as np
+
+        from components.abstract_renderer import MATERIAL_BLOCK_SIZE
+        from components.model_renderer import PreparedGeometry, load_mesh_cache, save_mesh_cache
+
+        prepared = PreparedGeometry(
+            positions=np.arange(9, dtype=np.float32).reshape(3, 3),
+            attributes=np.arange(3, dtype=np.uint32),
+            uv_normalized=True,
+            indices=np.array([0, 1, 2], dtype=np.uint16),
+            batch_materials=[np.ones(MATERIAL_BLOCK_SIZE // 4, dtype=np.float32)],
+            batch_ranges=[(0, 3)],
+        )
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, "model.obj.fragcache.npz")
+            save_mesh_cache(cache_path, "signature", [(0, "material")], b"key", prepared)
+
+            self.assertIsNone(load_mesh_cache(cache_path, "other signature"))
+            mesh_material_index_map, material_key, loaded = load_mesh_cache(cache_path, "signature")
+
+        self.assertEqual(mesh_material_index_map, [(0, "material")])
+        self.assertEqual(material_key, b"key")
+        self.assertTrue(loaded.uv_normalized)
+        self.assertEqual(loaded.batch_ranges, [(0, 3)])
+        self.assertEqual(loaded.indices.dtype, np.uint16)
+        np.testing.assert_array_equal(loaded.positions, prepared.positions)
+        np.testing.assert_array_equal(loaded.batch_materials[0], prepared.batch_materials[0])
+
+    def test_corrupt_mesh_cache_is_rebuilt(self):
+        """
+        Test that a truncated or garbage mesh cache is ignored, deleted and rebuilt from the .obj file.
+        """
+        import shutil
+        import tempfile
+
+        from components.model_renderer import ModelRenderer, load_mesh_cache, mesh_cache_path
+
+        models_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
+        with tempfile.TemporaryDirectory() as model_dir:
+            for name in ("pyramid.obj", "pyramid.mtl"):
+                shutil.copy(os.path.join(models_dir, name), model_dir)
+            renderer = object.__new__(ModelRenderer)
+            renderer.obj_path = os.path.join(model_dir, "pyramid.obj")
+            renderer.fast_obj_loader = True
+            renderer.mesh_cache = True
+            renderer.pbr_extension_overrides = {}
+            cache_path = mesh_cache_path(renderer.obj_path)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                renderer.prepare_model({})
+            with open(cache_path, "rb") as cache_file:
+                valid_cache = cache_file.read()
+
+            for corrupt_cache in (valid_cache[: len(valid_cache) // 2], b"not a cache"):
+                with open(cache_path, "wb") as cache_file:
+                    cache_file.write(corrupt_cache)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.assertIsNone(load_mesh_cache(cache_path, "signature"))
+                self.assertFalse(os.path.exists(cache_path))
+
+                with open(cache_path, "wb") as cache_file:
+                    cache_file.write(corrupt_cache)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scene, _, _, prepared = renderer.prepare_model({})
+                    cached = renderer.prepare_model({})
+                self.assertIsNotNone(scene)
+                self.assertIsNotNone(prepared)
+                # The rebuilt cache is complete and used on the next load
+                self.assertIsNone(cached[0])
+                self.assertEqual(cached[3].indices.tolist(), prepared.indices.tolist())
+            self.assertEqual([name for name in os.listdir(model_dir) if name.endswith(".tmp")], [])
+
 
 class TestBenchmarkManagerHeadless(unittest.TestCase):
     """